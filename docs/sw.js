@@ -1,3 +1,19 @@
+const SCHEDULE_CACHE = 'rosters-v1';
 self.addEventListener('install', e => self.skipWaiting());
 self.addEventListener('activate', e => self.clients.claim());
-self.addEventListener('fetch', e => e.respondWith(fetch(e.request)));
+self.addEventListener('fetch', e => {
+  const url = new URL(e.request.url);
+  if (e.request.method === 'GET' && url.searchParams.has('v') && /\/import\/schedules\/[^/]+\.json$/.test(url.pathname)) {
+    // ?v=<data hash> URLs are content-addressed (unversioned ones go to the network): serve a cache hit as-is, hit the network only on a miss,
+    // and drop entries for older versions of the same file once the new one is stored
+    e.respondWith(caches.open(SCHEDULE_CACHE).then(c => c.match(e.request).then(cached => cached || fetch(e.request).then(r => {
+      if (r.ok) {
+        c.put(e.request, r.clone());
+        c.keys().then(ks => ks.forEach(k => { const u = new URL(k.url); if (u.pathname === url.pathname && u.search !== url.search) c.delete(k); }));
+      }
+      return r;
+    }))));
+    return;
+  }
+  e.respondWith(fetch(e.request));
+});
@@ -14,6 +14,9 @@ Outputs:
 - docs/import/now/index.html     (alias to today's duty roster page for "Now")
 - docs/import/schedules/<id>.json  (per-employee month schedule for Import My Schedule page)
 - docs/import/my-schedules/index.html (simple My Schedule viewer)
+- *.gz / *.br siblings of the CSS/JSON above when IMPORT_PRECOMPRESS=1
+  (only useful behind a host/CDN that serves precompressed files; GitHub Pages does not).
+  HTML is skipped: the workflow rewrites index.html files after this script runs.
 
 Note: You can integrate this with your existing My Schedule UI later.
 """
@@ -25,18 +28,34 @@ import re
 import json
 import datetime as dt
 import calendar
+import functools
+import gzip
+import hashlib
+import shutil
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, Any, List, Tuple
 
 import requests
 import pandas as pd
 
+try:
+    import brotli  # optional — enables .br siblings when IMPORT_PRECOMPRESS=1
+except ImportError:
+    brotli = None
+
 
 # =========================
 # CONFIG
 # =========================
 MUSCAT_UTC_OFFSET_HOURS = 4
 
+# Write .gz/.br copies of generated text assets (for Cloudflare/Netlify style hosting)
+PRECOMPRESS = os.getenv("IMPORT_PRECOMPRESS", "").strip().lower() in ("1", "true", "yes")
+# لا نضغط HTML — الـ workflow يعدّل index.html بعد التوليد (Eid overlay / redirect) فتصبح النسخ قديمة
+PRECOMPRESS_SUFFIXES = (".css", ".json")
+
 # Department code -> full name (EDIT THIS)
 DEPT_FULL: Dict[str, str] = {
     "SUPV": "Supervisors",
@@ -51,6 +70,9 @@ DEPT_FULL: Dict[str, str] = {
 # If you want Arabic display names too, you can extend this dict later.
 # DEPT_FULL_AR = {...}
 
+_MONTHS = ("January", "February", "March", "April", "May", "June",
+           "July", "August", "September", "October", "November", "December")
+
 
 # =========================
 # HELPERS
@@ -66,17 +88,36 @@ def muscat_today() -> dt.date:
 def month_start(d: dt.date) -> dt.date:
     return dt.date(d.year, d.month, 1)
 
+@functools.lru_cache(maxsize=1024)
+def _dim(year: int, month: int) -> int:
+    """Number of days in the given month."""
+    return calendar.monthrange(year, month)[1]
+
 def add_months(d: dt.date, delta: int) -> dt.date:
     y = d.year + (d.month - 1 + delta) // 12
     m = (d.month - 1 + delta) % 12 + 1
-    day = min(d.day, calendar.monthrange(y, m)[1])
+    day = min(d.day, _dim(y, m))
     return dt.date(y, m, day)
 
 def iter_month_days(year: int, month: int):
-    dim = calendar.monthrange(year, month)[1]
+    dim = _dim(year, month)
     for day in range(1, dim + 1):
         yield dt.date(year, month, day)
 
+def precompress_tree(root: Path) -> int:
+    """Write gzip (and brotli, if installed) siblings for every text asset under root."""
+    count = 0
+    for p in root.rglob("*"):
+        if not p.is_file() or p.suffix not in PRECOMPRESS_SUFFIXES:
+            continue
+        raw = p.read_bytes()
+        # mtime=0 keeps the .gz bytes stable between runs so git only sees real changes
+        p.with_name(p.name + ".gz").write_bytes(gzip.compress(raw, compresslevel=9, mtime=0))
+        if brotli is not None:
+            p.with_name(p.name + ".br").write_bytes(brotli.compress(raw, quality=11))
+        count += 1
+    return count
+
 def _candidate_urls(url: str) -> list:
     """
     Return a list of candidate download URLs to try in order.
@@ -119,8 +160,11 @@ def _candidate_urls(url: str) -> list:
     return candidates
 
 
-def download_excel(url: str) -> bytes:
-    """Download Excel from OneDrive/SharePoint share link — tries multiple strategies."""
+def download_excel(url: str, dst: Path) -> str:
+    """Stream Excel from OneDrive/SharePoint share link into *dst* — tries multiple strategies.
+
+    The file is hashed while it is written; returns the SHA-256 hex digest.
+    """
     if not url:
         raise ValueError("IMPORT_EXCEL_URL is empty")
 
@@ -133,17 +177,25 @@ def download_excel(url: str) -> bytes:
     for i, dl_url in enumerate(_candidate_urls(url), 1):
         print(f"    [Strategy {i}] Trying: {dl_url[:90]}...")
         try:
-            r = requests.get(dl_url, headers=headers, timeout=90, allow_redirects=True)
-            r.raise_for_status()
-            data = r.content or b""
-            ctype = (r.headers.get("Content-Type") or "").lower()
-            if data.startswith(b"PK"):
-                print(f"    ✅ Strategy {i} succeeded!")
-                return data
+            with requests.get(dl_url, headers=headers, timeout=90, allow_redirects=True, stream=True) as r:
+                r.raise_for_status()
+                chunks = r.iter_content(1 << 16)
+                head = next(chunks, b"")
+                ctype = (r.headers.get("Content-Type") or "").lower()
+                if head.startswith(b"PK"):
+                    h = hashlib.sha256(head)
+                    with open(dst, "wb") as f:
+                        f.write(head)
+                        for chunk in chunks:
+                            h.update(chunk)
+                            f.write(chunk)
+                    print(f"    ✅ Strategy {i} succeeded!")
+                    return h.hexdigest()
             hint = " (got HTML — link may require sign-in)" if "text/html" in ctype else ""
             last_error = f"Not a valid .xlsx (Content-Type: {ctype or 'unknown'}){hint}"
             print(f"    ⚠️  Strategy {i} got non-xlsx response — trying next...")
         except Exception as e:
+            Path(dst).unlink(missing_ok=True)
             last_error = str(e)
             print(f"    ⚠️  Strategy {i} failed: {e} — trying next...")
 
@@ -182,29 +234,57 @@ def download_text(url: str) -> str:
 
 
 
+# Off-day codes, matched against the whole stripped code
+_OFF_SET = frozenset(("O", "OFF", "OFFDAY", "OFF DAY"))
+# Shift-code prefixes, matched against the first two characters of the code
+_MORNING_SET = frozenset(("MN", "ME"))
+_AFTERNOON_SET = frozenset(("AN", "AE"))
+_NIGHT_SET = frozenset(("NN", "NE"))
+_STANDBY_SET = frozenset(("ST", "SB"))
+
+# (bucket, icon, accent, bg, text_color) returned by shift_bucket
+_TUP_OTHER = ("Other", "•", "#94a3b8", "#f1f5f9", "#475569")
+_TUP_OFF = ("Off Day", "🛋️", "#6366f1", "#e0e7ff", "#3730a3")
+_TUP_MORNING = ("Morning", "☀️", "#f59e0b", "#fef3c7", "#92400e")
+_TUP_AFTERNOON = ("Afternoon", "🌤️", "#f97316", "#ffedd5", "#9a3412")
+_TUP_NIGHT = ("Night", "🌙", "#8b5cf6", "#ede9fe", "#5b21b6")
+_TUP_STANDBY = ("Standby", "🧍", "#9e9e9e", "#f0f0f0", "#555555")
+_TUP_SICK = ("Sick Leave", "🤒", "#ef4444", "#fee2e2", "#991b1b")
+_TUP_ANNUAL = ("Annual Leave", "✈️", "#10b981", "#d1fae5", "#065f46")
+_TUP_TRAIN = ("Training", "🎓", "#0ea5e9", "#e0f2fe", "#075985")
+_BUCKET_TUP = {t[0]: t for t in (_TUP_OTHER, _TUP_OFF, _TUP_MORNING, _TUP_AFTERNOON, _TUP_NIGHT,
+                                 _TUP_STANDBY, _TUP_SICK, _TUP_ANNUAL, _TUP_TRAIN)}
+
+
 def shift_bucket(code: str) -> Tuple[str, str, str, str, str]:
     """Return (bucket, icon, accent, bg, text_color)"""
     s = (code or "").strip().upper()
     if not s:
-        return ("Other", "•", "#94a3b8", "#f1f5f9", "#475569")
-
-    if s in {"O", "OFF", "OFFDAY", "OFF DAY"}:
-        return ("Off Day", "🛋️", "#6366f1", "#e0e7ff", "#3730a3")
-    if s.startswith(("MN", "ME")):
-        return ("Morning", "☀️", "#f59e0b", "#fef3c7", "#92400e")
-    if s.startswith(("AN", "AE")):
-        return ("Afternoon", "🌤️", "#f97316", "#ffedd5", "#9a3412")
-    if s.startswith(("NN", "NE")):
-        return ("Night", "🌙", "#8b5cf6", "#ede9fe", "#5b21b6")
-    if s.startswith(("ST", "SB")):
-        return ("Standby", "🧍", "#9e9e9e", "#f0f0f0", "#555555")
-    if "SICK" in s or s.startswith(("SL",)):
-        return ("Sick Leave", "🤒", "#ef4444", "#fee2e2", "#991b1b")
-    if "ANNUAL" in s or s.startswith(("AL",)):
-        return ("Annual Leave", "✈️", "#10b981", "#d1fae5", "#065f46")
+        return _TUP_OTHER
+
+    if s in _OFF_SET:
+        return _TUP_OFF
+    p = s[:2]
+    if p in _MORNING_SET:
+        return _TUP_MORNING
+    if p in _AFTERNOON_SET:
+        return _TUP_AFTERNOON
+    if p in _NIGHT_SET:
+        return _TUP_NIGHT
+    if p in _STANDBY_SET:
+        return _TUP_STANDBY
+    if "SICK" in s or p == "SL":
+        return _TUP_SICK
+    if "ANNUAL" in s or p == "AL":
+        return _TUP_ANNUAL
     if "TR" in s or "TRAIN" in s:
-        return ("Training", "🎓", "#0ea5e9", "#e0f2fe", "#075985")
-    return ("Other", "•", "#94a3b8", "#f1f5f9", "#475569")
+        return _TUP_TRAIN
+    return _TUP_OTHER
+
+
+def _nan(x: Any) -> bool:
+    """Cheap scalar stand-in for pd.isna() on single cell values."""
+    return x is None or x is pd.NaT or (isinstance(x, float) and x != x)
 
 
 def parse_month_sheet(xlsx_path: str, sheet_name: str, override_month_key: str | None = None) -> Dict[str, Any]:
@@ -250,6 +330,7 @@ def parse_month_sheet(xlsx_path: str, sheet_name: str, override_month_key: str |
 
     # Employees start after header_row
     employees: List[Dict[str, Any]] = []
+    cells = df.to_numpy(dtype=object)
     for r in range(header_row + 1, len(df)):
         dept = df.iloc[r, jd_col]
         name = df.iloc[r, name_col] if df.shape[1] > name_col else None
@@ -283,9 +364,10 @@ def parse_month_sheet(xlsx_path: str, sheet_name: str, override_month_key: str |
         emp_id = _clean(emp_id)
 
         shifts: Dict[int, str] = {}
+        row = cells[r]
         for day, c in date_cols.items():
-            cell = df.iloc[r, c] if c < df.shape[1] else None
-            if pd.isna(cell):
+            cell = row[c]
+            if _nan(cell):
                 continue
             s = str(cell).strip()
             if s:
@@ -304,13 +386,13 @@ def parse_month_sheet(xlsx_path: str, sheet_name: str, override_month_key: str |
     if m:
         month_name = m.group(1).title()
         year = int(m.group(2))
-        month_num = ["January","February","March","April","May","June","July","August","September","October","November","December"].index(month_name) + 1
+        month_num = MONTH_NAME_TO_NUM[month_name.lower()]
     elif override_month_key:
         # Use month extracted from filename (e.g. "2026-02" from IMP_FEB_2026.xlsx)
         try:
             oy, om = map(int, override_month_key.split("-"))
             year, month_num = oy, om
-            month_name = ["January","February","March","April","May","June","July","August","September","October","November","December"][om - 1]
+            month_name = _MONTHS[om - 1]
             print(f"  ℹ️  Sheet name has no month — using filename month: {month_name} {year}")
         except Exception:
             t = muscat_today()
@@ -323,6 +405,22 @@ def parse_month_sheet(xlsx_path: str, sheet_name: str, override_month_key: str |
     return {"sheet": sheet_name, "year": year, "month": month_num, "month_name": month_name, "employees": employees, "date_cols": date_cols}
 
 
+@functools.lru_cache(maxsize=8)
+def _sheet_index(xlsx_path: str, mtime_ns: int, size: int) -> Tuple[Tuple[str, ...], Tuple[str, ...], Dict[str, str]]:
+    """Return (sheet_names, normalized_names, {normalized: original}) for a workbook.
+
+    Cached per (path, mtime, size) so rewriting the file invalidates the entry.
+    """
+    names = tuple(pd.ExcelFile(xlsx_path).sheet_names)
+    upper = tuple(n.strip().upper() for n in names)
+    return names, upper, dict(zip(upper, names))
+
+
+def sheet_index(xlsx_path: str | Path) -> Tuple[Tuple[str, ...], Tuple[str, ...], Dict[str, str]]:
+    st = os.stat(xlsx_path)
+    return _sheet_index(str(xlsx_path), st.st_mtime_ns, st.st_size)
+
+
 def detect_sheet_month(xlsx_path: str, sheet_name: str) -> str | None:
     """
     يفحص أول 15 صف من الشيت ليكتشف الشهر الحقيقي:
@@ -437,7 +535,7 @@ def _format_event_date_range_label(text: str, fallback_date: dt.date) -> str | N
     if not month_num:
         return None
 
-    month_name = ["January","February","March","April","May","June","July","August","September","October","November","December"][month_num - 1]
+    month_name = _MONTHS[month_num - 1]
 
     # Only use the range if the currently generated page is inside that range.
     if fallback_date.year == year and fallback_date.month == month_num and start_day <= fallback_date.day <= end_day:
@@ -466,15 +564,50 @@ def display_date_label(date_obj: dt.date, parsed: Dict[str, Any]) -> str:
     return date_obj.strftime("%d %B %Y")
 
 
+# Static skeletons for the duty page cards, filled with a single %-format per card
+_EMP_ROW_TMPL = '<div class="emp-row"><span class="emp-name">%s &middot; %s</span><span class="emp-code" style="color:%s;">%s</span></div>'
+
+_SHIFT_CARD_TMPL = """
+    <details class="shift-card" data-shift="%s" style="border:1px solid %s44;background:%s" %s>
+      <summary class="shift-summary" style="background:%s;border-bottom:1px solid %s33;">
+        <span class="shift-icon">%s</span>
+        <span class="shift-label" data-shift="%s" style="color:%s;">%s</span>
+        <span class="shift-count" style="background:%s22;color:%s;">%d</span>
+      </summary>
+      <div class="shift-body">%s</div>
+    </details>
+"""
+
+_DEPT_CARD_TMPL = """
+    <div class="dept-card" style="animation-delay:%.2fs">
+      <div style="height:3px;background:linear-gradient(to right,%s,%s66)"></div>
+      <div class="dept-head">
+        <div class="dept-icon" style="background:%s22;color:%s;box-shadow:0 4px 12px %s30;">
+          <svg width="18" height="18" aria-hidden="true"><use href="#icon-dept"/></svg>
+        </div>
+        <div class="dept-title">%s</div>
+        <div class="dept-badge" style="background:%s20;color:%s;border:1px solid %s35;">
+          <span class="dept-badge-label">Total</span>
+          <span class="dept-badge-val">%d</span>
+        </div>
+      </div>
+      <div class="shift-stack">%s</div>
+    </div>
+"""
+
+
+@functools.lru_cache(maxsize=8)
+def _months_js(months: Tuple[str, ...]) -> str:
+    """JSON array of available months — identical for every day page of a run."""
+    return json.dumps(list(months))
+
+
 def build_duty_html(style: str, script: str, parsed: Dict[str, Any], date_obj: dt.date, repo_base_path: str, available_months: List[str] | None = None) -> str:
     day = date_obj.day
     date_label = display_date_label(date_obj, parsed)
     date_iso = date_obj.strftime("%Y-%m-%d")
     _month_first = dt.date(parsed["year"], parsed["month"], 1)
 
-    # قائمة الأشهر المتوفرة لـ JavaScript
-    available_months_js = json.dumps(available_months or [])
-
     # Date picker limits:
     # If main() provides nav_min_date/nav_max_date (based on available cached months),
     # use them to prevent selecting months that have no generated pages.
@@ -485,11 +618,11 @@ def build_duty_html(style: str, script: str, parsed: Dict[str, Any], date_obj: d
         # default: allow navigating prev/current/next month around the currently viewed month
         min_date = month_start(add_months(_month_first, -1)).strftime("%Y-%m-%d")
         _next_first = month_start(add_months(_month_first, +1))
-        _next_last = dt.date(_next_first.year, _next_first.month, calendar.monthrange(_next_first.year, _next_first.month)[1])
+        _next_last = dt.date(_next_first.year, _next_first.month, _dim(_next_first.year, _next_first.month))
         max_date = _next_last.strftime("%Y-%m-%d")
 
-    # dept -> bucket -> rows
-    dept_map: Dict[str, Dict[str, Dict[str, Any]]] = {}
+    # (dept, bucket) -> rows
+    groups: Dict[Tuple[str, str], List[Tuple[str, str, str]]] = defaultdict(list)
     total_emp = 0
 
     for emp in parsed["employees"]:
@@ -497,12 +630,9 @@ def build_duty_html(style: str, script: str, parsed: Dict[str, Any], date_obj: d
         if not code:
             continue
         total_emp += 1
-        dept = emp["dept_name"]
-        bucket, icon, accent, bg, text = shift_bucket(code)
-        dept_map.setdefault(dept, {}).setdefault(bucket, {"icon": icon, "accent": accent, "bg": bg, "text": text, "rows": []})
-        dept_map[dept][bucket]["rows"].append((emp["name"], emp["id"], code))
+        groups[(emp["dept_name"], shift_bucket(code)[0])].append((emp["name"], emp["id"], code))
 
-    depts = sorted(dept_map.items(), key=lambda x: x[0].lower())
+    depts = sorted(dict.fromkeys(dept for dept, _ in groups), key=str.lower)
     dept_count = len(depts)
 
     summary = f"""
@@ -527,51 +657,37 @@ def build_duty_html(style: str, script: str, parsed: Dict[str, Any], date_obj: d
     order = ["Morning","Afternoon","Night","Standby","Off Day","Annual Leave","Sick Leave","Training","Other"]
 
     cards = []
-    for i, (dept, buckets) in enumerate(depts):
+    for i, dept in enumerate(depts):
+        dept_rows = [(key, groups[(dept, key)]) for key in order if (dept, key) in groups]
         dept = str(dept).replace("\n"," ").replace("\r"," ").strip()
         color = palette[i % len(palette)]
-        total_in_dept = sum(len(v["rows"]) for v in buckets.values())
+        total_in_dept = sum(len(rows) for _, rows in dept_rows)
         shift_blocks = []
-        for key in order:
-            if key not in buckets:
-                continue
-            info = buckets[key]
-            rows = info["rows"]
+        for key, rows in dept_rows:
+            _, icon, accent, bg, text = _BUCKET_TUP[key]
             emp_rows = []
-            for idx, (name, empid, code) in enumerate(rows):
+            for name, empid, code in rows:
                 safe_name = str(name).replace("\n","").replace("\r","").replace("<","&lt;").replace(">","&gt;").strip()
                 safe_id   = str(empid).replace("\n","").replace("\r","").replace("<","&lt;").strip()
                 safe_code = str(code).replace("\n","").replace("\r","").replace("<","&lt;").strip()
-                emp_rows.append(f'<div class="emp-row"><span class="emp-name">{safe_name} &middot; {safe_id}</span><span class="emp-code" style="color:{info["text"]};">{safe_code}</span></div>')
-            shift_blocks.append(f"""
-    <details class="shift-card" data-shift="{key}" style="border:1px solid {info['accent']}44;background:{info['bg']}" {'open' if key=='Afternoon' else ''}>
-      <summary class="shift-summary" style="background:{info['bg']};border-bottom:1px solid {info['accent']}33;">
-        <span class="shift-icon">{info['icon']}</span>
-        <span class="shift-label" data-shift="{key}" style="color:{info['text']};">{key}</span>
-        <span class="shift-count" style="background:{info['accent']}22;color:{info['text']};">{len(rows)}</span>
-      </summary>
-      <div class="shift-body">{''.join(emp_rows)}</div>
-    </details>
-""")
-        cards.append(f"""
-    <div class="dept-card" style="animation-delay:{i*0.06:.2f}s">
-      <div style="height:3px;background:linear-gradient(to right,{color},{color}66)"></div>
-      <div class="dept-head">
-        <div class="dept-icon" style="background:{color}22;color:{color};box-shadow:0 4px 12px {color}30;">
-          <svg width="18" height="18" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2.2" stroke-linecap="round" stroke-linejoin="round">
-            <path d="M3 21h18M3 10h18M5 21V10l7-6 7 6v11"/>
-            <rect x="9" y="14" width="2" height="3"/><rect x="13" y="14" width="2" height="3"/>
-          </svg>
-        </div>
-        <div class="dept-title">{dept}</div>
-        <div class="dept-badge" style="background:{color}20;color:{color};border:1px solid {color}35;">
-          <span class="dept-badge-label">Total</span>
-          <span class="dept-badge-val">{total_in_dept}</span>
-        </div>
-      </div>
-      <div class="shift-stack">{''.join(shift_blocks)}</div>
-    </div>
-""")
+                emp_rows.append(_EMP_ROW_TMPL % (safe_name, safe_id, text, safe_code))
+            shift_blocks.append(_SHIFT_CARD_TMPL % (
+                key, accent, bg, "open" if key == "Afternoon" else "",
+                bg, accent,
+                icon,
+                key, text, key,
+                accent, text, len(rows),
+                "".join(emp_rows),
+            ))
+        cards.append(_DEPT_CARD_TMPL % (
+            i * 0.06,
+            color, color,
+            color, color, color,
+            dept,
+            color, color, color,
+            total_in_dept,
+            "".join(shift_blocks),
+        ))
 
     footer = f"""
   <div class="page-footer">
@@ -583,7 +699,7 @@ def build_duty_html(style: str, script: str, parsed: Dict[str, Any], date_obj: d
     # تنظيف المتغيرات من أي محتوى يكسر الـ HTML/JS
     safe_repo_base = repo_base_path.replace("'", "").replace("\\n", "").replace("\\r", "")
     safe_date_iso = date_iso.replace("'", "").replace("\\n", "")
-    safe_available_months_js = json.dumps(available_months or [])
+    safe_available_months_js = _months_js(tuple(available_months or ()))
 
     html = f"""<!doctype html>
 <html lang="en">
@@ -879,6 +995,12 @@ body:not(.light) .emp-code{{filter:brightness(1.4)}}
   </script>
 </head>
 <body>
+<svg width="0" height="0" style="position:absolute" aria-hidden="true">
+  <symbol id="icon-dept" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2.2" stroke-linecap="round" stroke-linejoin="round">
+    <path d="M3 21h18M3 10h18M5 21V10l7-6 7 6v11"/>
+    <rect x="9" y="14" width="2" height="3"/><rect x="13" y="14" width="2" height="3"/>
+  </symbol>
+</svg>
 <div class="wrap">
   <div class="header">
     <div class="header-shimmer"></div>
@@ -957,24 +1079,29 @@ function _wave(){{var h=document.getElementById('waveHand');if(!h)return;h.class
 
 
 
-def build_my_schedule_html(style: str, repo_base_path: str) -> str:
+def build_my_schedule_html(style: str, repo_base_path: str, schedules_version: str = "") -> str:
     """
     Full-featured Import My Schedule page — same design as Export my-schedule.
-    Uses docs/import/schedules/<id>.json
+    Uses docs/import/schedules/<id>.json?v=<schedules_version>
     """
-    return r"""<!DOCTYPE html>
-<html lang="en" dir="ltr">
+    html = r"""<!DOCTYPE html>
+<html lang="ar" dir="rtl">
 <head>
   <meta charset="utf-8"/>
   <meta name="viewport" content="width=device-width, initial-scale=1, viewport-fit=cover"/>
   <title>Import - My Schedule</title>
+  <script>(function(){try{document.documentElement.dataset.theme=localStorage.getItem('importPrefTheme')==='light'?'light':'dark';function hint(href){var l=document.createElement('link');l.rel='preload';l.as='fetch';l.crossOrigin='anonymous';l.href=href;document.head.appendChild(l);}if(localStorage.getItem('importPrefLang')==='en'){document.documentElement.lang='en';document.documentElement.dir='ltr';hint('../i18n/en.json');}var q=new URLSearchParams(location.search).get('emp'),id=q||localStorage.getItem('importSavedEmpId');var v='__SCHED_V__';if(id&&!sessionStorage.getItem('importSched:'+v+':'+id))hint((location.pathname.includes('/roster-site/')?'/roster-site':'')+'/import/schedules/'+encodeURIComponent(id)+'.json'+(v?'?v='+v:''));}catch(e){}})();</script>
   <link rel="preconnect" href="https://fonts.googleapis.com">
   <link rel="preconnect" href="https://fonts.gstatic.com" crossorigin>
+  <link rel="preconnect" href="https://cdnjs.cloudflare.com">
+  <link rel="dns-prefetch" href="https://fonts.googleapis.com">
+  <link rel="dns-prefetch" href="https://fonts.gstatic.com">
+  <link rel="dns-prefetch" href="https://cdnjs.cloudflare.com">
   <link href="https://fonts.googleapis.com/css2?family=Sora:wght@400;500;600;700;800&family=DM+Mono:wght@400;500&display=swap" rel="stylesheet">
   <style>
     *{box-sizing:border-box;margin:0;padding:0;-webkit-tap-highlight-color:transparent}
     :root{--bg:#0d1117;--surface:#161b22;--surface2:#1c2330;--surface3:#21262d;--border:rgba(255,255,255,.08);--border2:rgba(255,255,255,.12);--ink:#e6edf3;--muted:#8b949e;--dim:#484f58;--accent:#58a6ff;--r:12px;--r-lg:18px;--safe-top:env(safe-area-inset-top,0px);--safe-bot:env(safe-area-inset-bottom,0px);--glass-bg:rgba(255,255,255,.06);--glass-bg-hover:rgba(255,255,255,.10);--glass-border:rgba(255,255,255,.16);--glass-border-hover:rgba(255,255,255,.24);--glass-shadow:0 10px 28px rgba(0,0,0,.22);}
-    body.light{--bg:#f5f7fa;--surface:#ffffff;--surface2:#f0f2f5;--surface3:#e8ebf0;--border:rgba(0,0,0,.08);--border2:rgba(0,0,0,.13);--ink:#1a1f2e;--muted:#6b7280;--dim:#9ca3af;--accent:#1d6fd4;--glass-bg:rgba(255,255,255,.70);--glass-bg-hover:rgba(255,255,255,.86);--glass-border:rgba(0,0,0,.10);--glass-border-hover:rgba(0,0,0,.16);--glass-shadow:0 10px 24px rgba(0,0,0,.10);}
+    html[data-theme="light"]{--bg:#f5f7fa;--surface:#ffffff;--surface2:#f0f2f5;--surface3:#e8ebf0;--border:rgba(0,0,0,.08);--border2:rgba(0,0,0,.13);--ink:#1a1f2e;--muted:#6b7280;--dim:#9ca3af;--accent:#1d6fd4;--glass-bg:rgba(255,255,255,.70);--glass-bg-hover:rgba(255,255,255,.86);--glass-border:rgba(0,0,0,.10);--glass-border-hover:rgba(0,0,0,.16);--glass-shadow:0 10px 24px rgba(0,0,0,.10);}
     html{background:var(--bg);color:var(--ink);font-size:15px;scroll-behavior:smooth}
     body{font-family:'Sora',system-ui,-apple-system,sans-serif;background:var(--bg);min-height:100dvh;-webkit-font-smoothing:antialiased;overflow-x:hidden;transition:background .2s,color .2s;padding-top:64px;}
     body.ar{direction:rtl}
@@ -987,7 +1114,7 @@ def build_my_schedule_html(style: str, repo_base_path: str) -> str:
     @keyframes spin{to{transform:rotate(360deg)}}
     .topbar{position:fixed;top:0;left:0;right:0;z-index:100;padding-top:var(--safe-top);background:linear-gradient(135deg,rgba(3,5,11,.99) 0%,rgba(6,10,19,.99) 60%,rgba(4,7,15,.99) 100%);backdrop-filter:blur(28px) saturate(220%);-webkit-backdrop-filter:blur(28px) saturate(220%);border-bottom:1px solid rgba(56,139,253,.18);box-shadow:0 8px 32px rgba(0,0,0,.85),0 3px 10px rgba(0,0,0,.7),inset 0 1px 0 rgba(255,255,255,.04);overflow:visible;}
     .topbar::before{content:'';position:absolute;bottom:0;left:0;right:0;height:1px;background:linear-gradient(90deg,transparent 0%,rgba(56,139,253,.5) 30%,rgba(63,185,80,.4) 60%,rgba(188,140,255,.4) 80%,transparent 100%);background-size:200% 100%;animation:aurora 4s ease infinite;pointer-events:none;}
-    body.light .topbar{background:rgba(225,232,245,.97);border-bottom-color:rgba(29,111,212,.18);box-shadow:0 6px 24px rgba(0,0,0,.18);}
+    html[data-theme="light"] .topbar{background:rgba(225,232,245,.97);border-bottom-color:rgba(29,111,212,.18);box-shadow:0 6px 24px rgba(0,0,0,.18);}
     .topbar-inner{display:flex;align-items:center;padding:11px 20px;gap:10px;max-width:1080px;margin:0 auto;}
     .home-btn{width:38px;height:38px;background:rgba(255,255,255,.06);border:1px solid rgba(255,255,255,.12);border-radius:10px;display:grid;place-items:center;cursor:pointer;transition:all .18s;flex:0 0 auto;}
     .home-btn svg{width:19px;height:19px;transition:transform .18s;}
@@ -1009,9 +1136,9 @@ def build_my_schedule_html(style: str, repo_base_path: str) -> str:
     .brand-sq{position:absolute;inset:0;width:38px;height:38px;border-radius:10px;background:linear-gradient(135deg,#1f6feb,#388bfd);display:grid;place-items:center;font-size:18px;border:none;color:#fff;box-shadow:0 0 0 1px rgba(56,139,253,.28),0 4px 12px rgba(31,111,235,.28);cursor:pointer;opacity:0;transform:scale(.98);transition:opacity .25s ease,transform .25s ease;pointer-events:none;}
     .brand-sq.show{opacity:1;transform:scale(1);pointer-events:auto;}
     .aurora-bar{position:fixed;z-index:99;height:22px;left:0;right:0;overflow:visible;pointer-events:none;}
-    .aurora-bar-inner{position:absolute;bottom:0;left:4%;right:4%;height:22px;border-radius:0 0 60% 60%;background:linear-gradient(90deg,#1f6feb,#58a6ff,#3fb950,#bc8cff,#ff7b72,#58a6ff,#1f6feb);background-size:300% 100%;filter:blur(10px);opacity:0;transform:translateY(-100%) scaleX(.7);transition:opacity .2s ease,transform .2s cubic-bezier(.22,1,.36,1);animation:aurora 4s ease infinite;}
-    .aurora-bar-inner.visible{opacity:.35;transform:translateY(0) scaleX(1);}
-    body.light .aurora-bar-inner{opacity:0!important;}
+    .aurora-bar-inner{position:absolute;bottom:0;left:4%;right:4%;height:22px;border-radius:0 0 60% 60%;background:linear-gradient(90deg,#1f6feb,#58a6ff,#3fb950,#bc8cff,#ff7b72,#58a6ff,#1f6feb);background-size:300% 100%;filter:blur(10px);opacity:0;transform:translateY(-100%) scaleX(.7);transition:opacity .2s ease,transform .2s cubic-bezier(.22,1,.36,1);animation:aurora 4s ease infinite;animation-play-state:paused;}
+    .aurora-bar-inner.visible{opacity:.35;transform:translateY(0) scaleX(1);animation-play-state:running;will-change:opacity,transform;}
+    html[data-theme="light"] .aurora-bar-inner{opacity:0!important;animation-play-state:paused;}
     .search-section{padding:16px 20px 0;max-width:960px;margin:0 auto;}
     .search-form{display:flex;gap:8px;align-items:center}
     .search-avatar-wrap{display:flex;align-items:center;gap:4px;flex:0 0 auto;}
@@ -1028,7 +1155,7 @@ def build_my_schedule_html(style: str, repo_base_path: str) -> str:
     .search-btn{height:36px;padding:0 18px;background:linear-gradient(135deg,#1553c7,#1f6feb)!important;border:1px solid rgba(56,139,253,.6)!important;color:#fff!important;border-radius:10px;font-size:13px;font-weight:700;white-space:nowrap;transition:filter .15s,transform .1s;box-shadow:0 4px 18px rgba(31,111,235,.55),inset 0 1px 0 rgba(255,255,255,.18)!important;flex:0 0 auto;letter-spacing:.2px;}
     .search-btn:hover{filter:brightness(1.15)}.search-btn:active{transform:scale(.97)}
     .month-picker-btn{display:flex;align-items:center;gap:6px;background:rgba(255,255,255,.08)!important;border:1px solid rgba(255,255,255,.18)!important;color:var(--ink)!important;border-radius:10px!important;padding:0 10px!important;height:32px!important;font-size:12px!important;font-weight:700;font-family:'DM Mono',monospace;cursor:pointer;transition:all .15s;white-space:nowrap;flex:0 0 auto;backdrop-filter:blur(14px) saturate(160%);-webkit-backdrop-filter:blur(14px) saturate(160%);}
-    body.light .month-picker-btn{background:rgba(255,255,255,.75)!important;border:1px solid rgba(0,0,0,.12)!important;}
+    html[data-theme="light"] .month-picker-btn{background:rgba(255,255,255,.75)!important;border:1px solid rgba(0,0,0,.12)!important;}
     .month-picker-btn:hover{background:rgba(255,255,255,.14)!important;}
     .month-picker-btn .mpb-arrow{font-size:10px;opacity:.6}
     .month-popup{position:absolute;top:calc(100% + 8px);z-index:200;background:var(--surface);border:1px solid var(--border2);border-radius:14px;padding:10px;box-shadow:0 16px 40px rgba(0,0,0,.45);display:none;min-width:200px;animation:popIn .18s cubic-bezier(.22,1,.36,1);}
@@ -1048,81 +1175,33 @@ def build_my_schedule_html(style: str, repo_base_path: str) -> str:
     .emp-right{display:flex;flex-direction:column;align-items:flex-end;gap:8px;flex:0 0 auto;}
     body.ar .emp-right{align-items:flex-start;}
     .month-wrap{position:relative;flex:0 0 auto;margin-top:2px;}
-    .change-btn{width:34px;height:34px;background:var(--glass-bg);border:1px solid var(--glass-border);color:var(--muted);border-radius:9px;font-size:16px;display:grid;place-items:center;flex:0 0 auto;transition:all .15s;backdrop-filter:blur(14px) saturate(170%);}
-    .change-btn:hover{background:var(--glass-bg-hover);border-color:var(--glass-border-hover);color:var(--ink);transform:translateY(-1px);}
-    .stats-row{display:grid;grid-template-columns:repeat(7,1fr);gap:10px;}
-    @media(max-width:700px){.stats-row{grid-template-columns:repeat(4,1fr)}}
-    @media(max-width:400px){.stats-row{grid-template-columns:repeat(2,1fr)}}
-    .stat-card{background:var(--surface);border:1px solid var(--border);border-radius:var(--r);padding:16px 8px 14px;text-align:center;position:relative;overflow:hidden;transition:border-color .2s,transform .15s,box-shadow .15s;}
-    .stat-card:hover{border-color:var(--border2);transform:translateY(-2px);box-shadow:0 8px 24px rgba(0,0,0,.3);}
-    .stat-card::after{content:'';position:absolute;top:0;left:0;right:0;height:3px;}
-    .stat-card.c-blue::after{background:linear-gradient(90deg,#1f6feb,#58a6ff)}.stat-card.c-gray::after{background:linear-gradient(90deg,#484f58,#8b949e)}.stat-card.c-amber::after{background:linear-gradient(90deg,#b45309,#d29922)}.stat-card.c-orange::after{background:linear-gradient(90deg,#c2410c,#db6d28)}.stat-card.c-purple::after{background:linear-gradient(90deg,#7c3aed,#bc8cff)}.stat-card.c-pink::after{background:linear-gradient(90deg,#be185d,#ff7b72)}.stat-card.c-green::after{background:linear-gradient(90deg,#15803d,#3fb950)}
-    .stat-ico{font-size:18px;margin-bottom:6px;display:block}.stat-val{font-size:24px;font-weight:800;color:var(--ink);font-family:'DM Mono',monospace;line-height:1}.stat-lbl{font-size:9.5px;color:var(--muted);font-weight:600;margin-top:5px;line-height:1.3}
+    .state-view{background:var(--surface);border:1px solid var(--border);border-radius:var(--r-lg);padding:48px 24px;text-align:center;}
+    .state-emoji{font-size:42px;display:block;margin-bottom:12px}.state-title{font-size:18px;font-weight:700;color:var(--ink);margin-bottom:6px}.state-desc{font-size:13px;color:var(--muted);line-height:1.65;max-width:38ch;margin:0 auto}
+    .spin{width:36px;height:36px;border:2.5px solid var(--border2);border-top-color:var(--accent);border-radius:50%;animation:spin 1s linear infinite;margin:0 auto 14px;will-change:transform;backface-visibility:hidden;}
+    .modal{position:fixed;inset:0;z-index:999;display:none;align-items:flex-end;justify-content:center;padding:0;}
+    @media(min-width:600px){.modal{align-items:center;padding:20px}}
+    .modal.open{display:flex}
     .cal-card{background:var(--surface);border:1px solid var(--border);border-radius:var(--r-lg);overflow:hidden;}
     .cal-head{display:grid;grid-template-columns:repeat(7,1fr);background:var(--surface2);border-bottom:1px solid var(--border);}
     .cal-head div{padding:14px 4px;text-align:center;font-size:12px;font-weight:700;color:var(--muted);letter-spacing:.5px;text-transform:uppercase;}
     .cal-body{display:grid;grid-template-columns:repeat(7,1fr);}
-    .day{background:var(--surface);min-height:72px;padding:8px 7px 7px;display:flex;flex-direction:column;position:relative;transition:background .1s;border-right:1px solid var(--border);border-bottom:1px solid var(--border);overflow:hidden;}
+    .day{background:var(--shift-bg,var(--surface));min-height:72px;padding:8px 7px 7px;display:flex;flex-direction:column;position:relative;transition:background .1s;border-right:1px solid var(--border);border-bottom:1px solid var(--border);overflow:hidden;}
     .day:nth-child(7n){border-right:none}
     @media(max-width:380px){.day{min-height:60px;padding:4px 3px}}
     .day.empty{background:rgba(13,17,23,.5);}
-    body.light .day.empty{background:rgba(240,242,245,.6)}
-    .dnum{position:absolute;top:6px;left:0;right:0;text-align:center;font-size:clamp(20px,4vw,36px);font-weight:900;color:var(--ink);opacity:.22;font-family:'DM Mono',monospace;line-height:1;pointer-events:none;z-index:1;}
+    html[data-theme="light"] .day.empty{background:rgba(240,242,245,.6)}
+    .dnum{position:absolute;top:6px;left:0;right:0;text-align:center;font-size:clamp(20px,4vw,36px);font-weight:900;color:var(--shift-color,var(--ink));opacity:.22;font-family:'DM Mono',monospace;line-height:1;pointer-events:none;z-index:1;}
     .day.today .dnum{color:var(--accent);opacity:.35}
-    .day-code{position:absolute;bottom:8px;left:0;right:0;text-align:center;font-size:clamp(13px,2.6vw,24px);font-weight:900;font-family:'DM Mono',monospace;letter-spacing:-.3px;white-space:nowrap;z-index:2;line-height:1;}
+    .day-code{position:absolute;bottom:8px;left:0;right:0;text-align:center;font-size:clamp(13px,2.6vw,24px);font-weight:900;font-family:'DM Mono',monospace;letter-spacing:-.3px;white-space:nowrap;z-index:2;line-height:1;color:var(--shift-color);}
     .day.today{background:rgba(31,111,235,.1)!important}.day.today::before{content:'';position:absolute;top:0;left:0;right:0;height:2.5px;background:linear-gradient(90deg,#1f6feb,#58a6ff);z-index:3;}
-    .s-morning{background:#1a140a}.s-afternoon{background:#1a0f07}.s-night{background:#110d1f}.s-off{background:#0f1117}.s-leave{background:#0a1410}.s-training{background:#0a1020}.s-standby{background:#1a0d14}.s-other{background:#111318}
-    body.light .s-morning{background:#fffbf0}body.light .s-afternoon{background:#fff7f0}body.light .s-night{background:#f5f3ff}body.light .s-off{background:#f8fafc}body.light .s-leave{background:#f0fdf4}body.light .s-training{background:#eff6ff}body.light .s-standby{background:#fdf2f8}body.light .day{background:var(--surface)}body.light .day.empty{background:rgba(245,247,250,.7)}
-    .s-morning .day-code{color:#d29922}.s-afternoon .day-code{color:#e8722a}.s-night .day-code{color:#bc8cff}.s-off .day-code{color:#8b949e}.s-leave .day-code{color:#3fb950}.s-training .day-code{color:#58a6ff}.s-standby .day-code{color:#ff7b72}.s-other .day-code{color:#8b949e}
-    .s-morning .dnum{color:#d29922}.s-afternoon .dnum{color:#e8722a}.s-night .dnum{color:#bc8cff}.s-off .dnum{color:#8b949e}.s-leave .dnum{color:#3fb950}.s-training .dnum{color:#58a6ff}.s-standby .dnum{color:#ff7b72}.s-other .dnum{color:#8b949e}
-    body.light .s-morning .day-code{color:#b45309}body.light .s-afternoon .day-code{color:#c2410c}body.light .s-night .day-code{color:#7c3aed}body.light .s-off .day-code{color:#6b7280}body.light .s-leave .day-code{color:#15803d}body.light .s-training .day-code{color:#1d4ed8}body.light .s-standby .day-code{color:#be185d}
-    body.light .s-morning .dnum{color:#b45309}body.light .s-afternoon .dnum{color:#c2410c}body.light .s-night .dnum{color:#7c3aed}body.light .s-off .dnum{color:#6b7280}body.light .s-leave .dnum{color:#15803d}body.light .s-training .dnum{color:#1d4ed8}body.light .s-standby .dnum{color:#be185d}
-    .actions-card{background:var(--surface);border:1px solid var(--border);border-radius:var(--r-lg);padding:14px;display:flex;flex-direction:column;gap:8px;}
-    .actions-grid{display:grid;grid-template-columns:repeat(3,1fr);gap:10px;}
-    .action-btn{display:flex;align-items:center;justify-content:center;gap:8px;color:#58a6ff!important;font-weight:700!important;background:linear-gradient(135deg,rgba(31,111,235,.18),rgba(56,139,253,.10))!important;border:1px solid rgba(56,139,253,.35)!important;border-radius:10px;padding:12px 10px;font-size:13px;transition:all .15s;min-height:48px;position:relative;backdrop-filter:blur(14px) saturate(170%);-webkit-backdrop-filter:blur(14px) saturate(170%);}
-    .action-btn:hover{color:#79b8ff!important;background:linear-gradient(135deg,rgba(31,111,235,.30),rgba(56,139,253,.20))!important;border-color:rgba(56,139,253,.6)!important;transform:translateY(-1px);}
-    .action-btn:active{transform:scale(.98)}.action-ico{font-size:16px;flex:0 0 auto}
-    .stats-modal-overlay{position:fixed;inset:0;background:rgba(0,0,0,.6);backdrop-filter:blur(4px);z-index:500;display:flex;align-items:center;justify-content:center;padding:20px;animation:fadeIn .15s ease;}
-    .stats-modal{background:var(--surface);border:1px solid var(--border2);border-radius:var(--r-lg);width:100%;max-width:560px;box-shadow:0 24px 64px rgba(0,0,0,.5);animation:popIn .2s cubic-bezier(.22,1,.36,1);overflow:hidden;}
-    .stats-modal-head{display:flex;align-items:center;justify-content:space-between;padding:14px 16px;border-bottom:1px solid var(--border);font-size:14px;font-weight:700;color:var(--ink);}
-    .stats-modal-close{width:28px;height:28px;background:rgba(255,255,255,.06);border:1px solid var(--border2);border-radius:7px;color:var(--muted);font-size:12px;display:grid;place-items:center;cursor:pointer;transition:all .15s;}
-    .stats-modal-close:hover{background:rgba(255,255,255,.12);color:var(--ink)}
-    .stats-modal-body{padding:16px;display:grid;grid-template-columns:repeat(4,1fr);gap:10px;}
-    @media(max-width:400px){.stats-modal-body{grid-template-columns:repeat(2,1fr)}}
-    .state-view{background:var(--surface);border:1px solid var(--border);border-radius:var(--r-lg);padding:48px 24px;text-align:center;}
-    .state-emoji{font-size:42px;display:block;margin-bottom:12px}.state-title{font-size:18px;font-weight:700;color:var(--ink);margin-bottom:6px}.state-desc{font-size:13px;color:var(--muted);line-height:1.65;max-width:38ch;margin:0 auto}
-    .spin{width:36px;height:36px;border:2.5px solid var(--border2);border-top-color:var(--accent);border-radius:50%;animation:spin 1s linear infinite;margin:0 auto 14px;}
-    .modal{position:fixed;inset:0;z-index:999;display:none;align-items:flex-end;justify-content:center;padding:0;}
-    @media(min-width:600px){.modal{align-items:center;padding:20px}}
-    .modal.open{display:flex}
-    .modal-backdrop{position:absolute;inset:0;background:rgba(0,0,0,.7);backdrop-filter:blur(8px);-webkit-backdrop-filter:blur(8px);}
-    .modal-sheet{position:relative;z-index:1;width:100%;max-width:540px;background:var(--surface);border:1px solid var(--border2);border-radius:24px 24px 0 0;overflow:hidden;animation:slideUp .25s cubic-bezier(.22,1,.36,1);max-height:85dvh;display:flex;flex-direction:column;}
-    @media(min-width:600px){.modal-sheet{border-radius:20px;max-width:560px}}
-    .modal-handle{width:40px;height:4px;background:var(--dim);border-radius:2px;margin:14px auto 0;opacity:.5}
-    .modal-head{padding:18px 22px 16px;border-bottom:1px solid var(--border);display:flex;align-items:flex-start;justify-content:space-between;gap:12px;}
-    .modal-title{font-size:18px;font-weight:700;color:var(--ink)}.modal-sub{font-size:13px;color:var(--muted);margin-top:4px;line-height:1.5}
-    .modal-close{width:36px;height:36px;border-radius:10px;background:rgba(255,255,255,.06);border:1px solid var(--border);color:var(--muted);font-size:16px;display:grid;place-items:center;flex:0 0 auto;transition:all .15s;}
-    .modal-close:hover{background:rgba(255,255,255,.12);color:var(--ink)}
-    .modal-body{overflow:auto;-webkit-overflow-scrolling:touch;padding:18px 22px;}
-    .modal-intro{background:rgba(88,166,255,.05);border:1px solid rgba(88,166,255,.15);border-radius:12px;padding:14px 16px;margin-bottom:14px;}
-    .modal-intro-title{font-size:14px;font-weight:700;color:var(--ink);margin-bottom:5px}.modal-intro-desc{font-size:13px;color:var(--muted);line-height:1.65}
-    .tip{display:flex;align-items:flex-start;gap:12px;padding:14px;border:1px solid var(--border);border-radius:12px;background:rgba(255,255,255,.02);}.tip+.tip{margin-top:10px}
-    .tip-ico{font-size:20px;flex:0 0 auto;margin-top:1px}.tip-text{font-size:13px;color:var(--muted);line-height:1.65;font-weight:500}
-    .modal-foot{position:sticky;bottom:0;background:linear-gradient(to bottom,rgba(0,0,0,0),rgba(0,0,0,.22));backdrop-filter:blur(10px);border-top:1px solid var(--border);padding:16px 22px calc(16px + var(--safe-bot));display:flex;justify-content:flex-end;}
-    body.light .modal-foot{background:linear-gradient(to bottom,rgba(255,255,255,0),rgba(255,255,255,.75));}
-    .ok-btn{height:40px;padding:0 20px;background:linear-gradient(135deg,#1f6feb,#388bfd);border:none;color:#fff;border-radius:10px;font-size:13px;font-weight:700;transition:filter .15s;}
-    .ok-btn:hover{filter:brightness(1.1)}
-    .tbtn{flex:1;height:36px;border-radius:8px;font-size:12px;font-weight:700;border:1px solid var(--border2);background:rgba(255,255,255,.05);color:var(--muted);transition:all .12s;}
-    .tbtn:hover{background:rgba(255,255,255,.1);color:var(--ink)}.tbtn.primary{background:linear-gradient(135deg,#1f6feb,#388bfd);border:none;color:#fff;}
-    .tbtn.primary:hover{filter:brightness(1.1)}
-    .toast-container{position:fixed;inset:0;z-index:9999;display:flex;align-items:center;justify-content:center;pointer-events:none;padding:20px;background:rgba(0,0,0,.45);backdrop-filter:blur(4px);}
-    .toast-card{pointer-events:auto;width:min(400px,100%);background:var(--surface);border:1px solid rgba(56,139,253,.25);border-radius:20px;padding:20px;box-shadow:0 24px 64px rgba(0,0,0,.7);animation:slideUp .22s cubic-bezier(.22,1,.36,1);}
-    .toast-row{display:flex;align-items:flex-start;gap:10px}
-    .toast-ico{width:38px;height:38px;border-radius:10px;background:rgba(88,166,255,.1);border:1px solid rgba(88,166,255,.2);display:grid;place-items:center;font-size:16px;flex:0 0 auto;}
-    .toast-text p{font-size:12.5px;color:var(--muted);line-height:1.55;font-weight:500}.toast-text strong{color:var(--ink)}
-    .toast-btns{display:flex;gap:8px;margin-top:10px}
+    .s-morning{--shift-bg:#1a140a;--shift-color:#d29922}.s-afternoon{--shift-bg:#1a0f07;--shift-color:#e8722a}.s-night{--shift-bg:#110d1f;--shift-color:#bc8cff}.s-off{--shift-bg:#0f1117;--shift-color:#8b949e}.s-leave{--shift-bg:#0a1410;--shift-color:#3fb950}.s-training{--shift-bg:#0a1020;--shift-color:#58a6ff}.s-standby{--shift-bg:#1a0d14;--shift-color:#ff7b72}.s-other{--shift-bg:#111318;--shift-color:#8b949e}
+    html[data-theme="light"] .s-morning{--shift-color:#b45309}html[data-theme="light"] .s-afternoon{--shift-color:#c2410c}html[data-theme="light"] .s-night{--shift-color:#7c3aed}html[data-theme="light"] .s-off{--shift-color:#6b7280}html[data-theme="light"] .s-leave{--shift-color:#15803d}html[data-theme="light"] .s-training{--shift-color:#1d4ed8}html[data-theme="light"] .s-standby{--shift-color:#be185d}
+    html[data-theme="light"] .day.today .dnum{color:var(--shift-color,var(--accent))}
+    html[data-theme="light"] .day{background:var(--surface)}html[data-theme="light"] .day.empty{background:rgba(245,247,250,.7)}
     @media print{.topbar,.search-section,.toast-container,.modal,.actions-card{display:none!important}body{background:#fff;color:#000}}
   </style>
+  <link rel="preload" href="../roster.css" as="style" onload="this.onload=null;this.rel='stylesheet'">
+  <noscript><link rel="stylesheet" href="../roster.css"></noscript>
 </head>
 <body>
 
@@ -1181,13 +1260,21 @@ def build_my_schedule_html(style: str, repo_base_path: str) -> str:
   </div>
 </main>
 
-<footer style="text-align:center;padding:18px 16px 28px;display:flex;flex-direction:column;align-items:center;gap:4px;pointer-events:none;user-select:none;">
+<footer style="text-align:center;padding:18px 16px 28px;display:flex;flex-direction:column;align-items:center;gap:4px;pointer-events:none;user-select:none;content-visibility:auto;contain-intrinsic-size:auto 64px;">
   <span style="font-size:10px;font-weight:600;letter-spacing:1px;text-transform:uppercase;color:rgba(139,148,158,.45);">khalidsaif912.github.io/roster-site</span>
   <span id="footerCredit" style="font-size:10px;font-weight:600;letter-spacing:.6px;color:rgba(139,148,158,.45);">Design: KHALID ALRAQADI</span>
 </footer>
 
 <div class="toast-container" id="toastMount" style="display:none"></div>
 
+<template id="tplToast"><div class="toast-card"><div class="toast-row"><div class="toast-ico">💾</div><div class="toast-text"><p><strong class="toast-title"></strong><br><span class="toast-sub"></span></p></div></div><div class="toast-btns"><button class="tbtn primary" type="button" data-action="save"></button><button class="tbtn" type="button" data-action="dismiss"></button></div></div></template>
+<template id="tplStateLoading"><div class="state-view"><div class="spin"></div><div class="state-title"></div></div></template>
+<template id="tplStateError"><div class="state-view"><span class="state-emoji">❌</span><div class="state-title"></div><div class="state-desc"></div></div></template>
+<template id="tplSchedule"><div id="exportArea" class="export-area"><div class="emp-banner"><div class="emp-info"><div class="emp-name-row"><div class="emp-name"></div></div><div class="emp-dept"></div></div><div class="emp-right"><div class="month-wrap"><button class="month-picker-btn" id="mpBtn" onclick="toggleMonthPicker()"><span class="mpb-label"></span> <span class="mpb-arrow">▼</span></button><div class="month-popup" id="monthPopup"><div class="month-popup-grid"></div></div></div></div></div><div class="cal-card"><div class="cal-head"></div><div class="cal-body"></div></div></div><div class="actions-card"><div class="actions-grid"><button class="action-btn" onclick="dlPDF()"><span class="action-ico">📄</span>PDF</button><button class="action-btn" onclick="dlIMG()"><span class="action-ico">🖼️</span><span data-lbl="img"></span></button><button class="action-btn" onclick="openStatsModal()"><span class="action-ico">📊</span><span data-lbl="stats"></span></button></div><div class="actions-grid" style="margin-top:8px"><button class="action-btn" onclick="dlICS()"><span class="action-ico">📆</span>ICS</button><button class="action-btn" onclick="shareS()"><span class="action-ico">🔗</span><span data-lbl="share"></span></button><button class="action-btn" onclick="window.print()"><span class="action-ico">🖨️</span><span data-lbl="print"></span></button></div></div><div class="stats-modal-overlay" id="statsModalOverlay" onclick="closeStatsModal()" style="display:none"><div class="stats-modal" onclick="event.stopPropagation()"><div class="stats-modal-head"><span data-lbl="statsTitle"></span><button onclick="closeStatsModal()" class="stats-modal-close">✕</button></div><div class="stats-modal-body"></div></div></div></template>
+<template id="tplDay"><div class="day"><span class="dnum"></span></div></template>
+<template id="tplStat"><div class="stat-card"><span class="stat-ico"></span><div class="stat-val"></div><div class="stat-lbl"></div></div></template>
+<template id="tplMpItem"><div class="mp-item"></div></template>
+
 <div class="modal" id="idActionModal" role="dialog" aria-modal="true" style="align-items:center;padding:20px">
   <div class="modal-backdrop" onclick="closeIdActionModal()"></div>
   <div class="modal-sheet" style="border-radius:20px;max-width:400px;width:100%">
@@ -1226,74 +1313,239 @@ def build_my_schedule_html(style: str, repo_base_path: str) -> str:
   </div>
 </div>
 
-<script src="https://cdnjs.cloudflare.com/ajax/libs/jspdf/2.5.1/jspdf.umd.min.js"></script>
-<script src="https://cdnjs.cloudflare.com/ajax/libs/html2canvas/1.4.1/html2canvas.min.js"></script>
 <script>
+  var R={};['area','empId','sbtn','ttl','sub','langBtn','themeBtn','toastMount','tplToast','tplStateLoading','tplStateError','tplSchedule','tplDay','tplStat','tplMpItem','searchAvatar','searchAvatarWrap','searchChangeBtn','tipsModal','tipsTitleModal','tipsSub','miTitle','miDesc','tip1','tip2','tip3','tipsOk','footerCredit','idActionModal','idActionTitle','idActionIntroTitle','idActionIntroDesc','idActionCancel','idActionOk'].forEach(function(k){R[k]=document.getElementById(k);});
+  var SCHED_V='__SCHED_V__';
   function schedulesUrl(id){
     var base=location.pathname.includes('/roster-site/')?'/roster-site':'';
-    return base+'/import/schedules/'+encodeURIComponent(id)+'.json';
+    return base+'/import/schedules/'+encodeURIComponent(id)+'.json'+(SCHED_V?'?v='+SCHED_V:'');
   }
+  if('serviceWorker' in navigator&&location.pathname.includes('/roster-site/'))navigator.serviceWorker.register('/roster-site/sw.js?v=9');
   var data=null,month=null,months=[],lang='ar',theme='dark';
-  (function(){var sl=localStorage.getItem('importPrefLang'),st=localStorage.getItem('importPrefTheme');if(sl==='en'||sl==='ar')lang=sl;if(st==='light'||st==='dark')theme=st;if(theme==='light')document.body.classList.add('light');if(lang==='en'){document.documentElement.lang='en';document.documentElement.dir='ltr';}})();
+  (function(){var sl=localStorage.getItem('importPrefLang'),st=localStorage.getItem('importPrefTheme');if(sl==='en'||sl==='ar')lang=sl;if(st==='light'||st==='dark')theme=st;document.documentElement.dataset.theme=theme;if((navigator.hardwareConcurrency||8)<=4)document.body.classList.add('lowfx');if(lang==='en'){document.documentElement.lang='en';document.documentElement.dir='ltr';}})();
   var STAT_META=[{k:'work',icon:'💼',c:'c-blue',label_en:'Work Days',label_ar:'أيام عمل'},{k:'off',icon:'🛌',c:'c-gray',label_en:'Days Off',label_ar:'أيام راحة'},{k:'morning',icon:'☀️',c:'c-amber',label_en:'Morning',label_ar:'صباحي'},{k:'afternoon',icon:'🌤️',c:'c-orange',label_en:'Afternoon',label_ar:'مسائي'},{k:'night',icon:'🌙',c:'c-purple',label_en:'Night',label_ar:'ليلي'},{k:'standby',icon:'🧍',c:'c-pink',label_en:'Standby',label_ar:'احتياطي'},{k:'leaves',icon:'✈️',c:'c-green',label_en:'Leaves',label_ar:'إجازات'}];
-  var T={en:{title:'Import - My Schedule',sub:'Enter your Employee ID',heroTitle:'Your Import roster in one view',heroDesc:'Enter your Employee ID to view the month, export as PDF, Image, or add to your calendar.',tipsTitle:'Help & Tips',tipsSub:'Quick help for using the roster.',langBtn:'ع',ph:'e.g. 12345',sbtn:'📅 View',loading:'Loading…',notFound:'Employee not found',notFoundSub:'ID not in the system. Please check and try again.',e1:'Search your schedule',e2:'Enter your Employee ID above to view your monthly Import roster.',saveSub:'Open your schedule faster next time.',saveYes:'✅ Save',saveNo:'Not now',idActTitle:'Employee ID',idActChange:'Change saved ID?',idActChangeSub:'This will remove the saved ID from this device.',idActPin:'Set as My ID?',idActPinSub:'Save this ID on this device for faster access.',cancel:'Cancel',ok:'OK',days:['Sunday','Monday','Tuesday','Wednesday','Thursday','Friday','Saturday'],months:['January','February','March','April','May','June','July','August','September','October','November','December']},ar:{title:'الوارد - جدولي',sub:'أدخل رقمك الوظيفي',heroTitle:'جدول الوارد في عرض واحد',heroDesc:'أدخل رقمك الوظيفي لعرض الشهر، ثم حمّل PDF/صورة أو أضفه للتقويم.',tipsTitle:'مساعدة ونصائح',tipsSub:'مساعدة سريعة لاستخدام الجدول.',langBtn:'EN',ph:'مثال: 12345',sbtn:'📅 عرض',loading:'جاري التحميل…',notFound:'لم يُعثر على موظف',notFoundSub:'الرقم غير موجود في النظام. تحقق وأعد المحاولة.',e1:'ابحث عن جدولك',e2:'أدخل رقمك الوظيفي أعلاه لعرض مناوبات الوارد.',saveSub:'لفتح الجدول بسرعة في المرات القادمة.',saveYes:'✅ احفظ',saveNo:'ليس الآن',idActTitle:'الرقم الوظيفي',idActChange:'هل تريد حذف الرقم الوظيفي؟',idActChangeSub:'سيتم حذف الرقم المحفوظ من هذا الجهاز نهائياً.',idActPin:'هل تريد حفظ الرقم الوظيفي؟',idActPinSub:'سيتم حفظ هذا الرقم على هذا الجهاز لفتح الجدول بسرعة.',cancel:'إلغاء',ok:'موافق',days:['الأحد','الاثنين','الثلاثاء','الأربعاء','الخميس','الجمعة','السبت'],months:['يناير','فبراير','مارس','أبريل','مايو','يونيو','يوليو','أغسطس','سبتمبر','أكتوبر','نوفمبر','ديسمبر']}};
+  var T={ar:__I18N_AR__},_i18n={};
+  function loadLang(l){if(T[l])return Promise.resolve(T[l]);if(!_i18n[l])_i18n[l]=fetch('../i18n/'+l+'.json').then(function(r){if(!r.ok)throw new Error('i18n');return r.json();}).then(function(d){T[l]=d;return d;}).catch(function(e){delete _i18n[l];throw e;});return _i18n[l];}
+  var langReady=loadLang(lang).catch(function(){lang='ar';return T.ar;});
   function t(k){return T[lang][k];}
-  function esc(s){return String(s==null?'':s).replace(/&/g,'&amp;').replace(/</g,'&lt;').replace(/>/g,'&gt;').replace(/"/g,'&quot;');}
-  document.getElementById('themeBtn').textContent=theme==='dark'?'🌙':'☀️';
-  function applyLangUI(){document.documentElement.lang=lang;document.documentElement.dir=lang==='ar'?'rtl':'ltr';document.body.classList.toggle('ar',lang==='ar');document.getElementById('ttl').textContent=t('title');document.getElementById('sub').textContent=t('sub');document.getElementById('langBtn').textContent=t('langBtn');document.getElementById('empId').placeholder=t('ph');document.getElementById('sbtn').textContent=t('sbtn');var e1=document.getElementById('e1'),e2=document.getElementById('e2');if(e1)e1.textContent=t('e1');if(e2)e2.textContent=t('e2');document.getElementById('tipsTitleModal').textContent=t('tipsTitle');document.getElementById('tipsSub').textContent=t('tipsSub');document.getElementById('miTitle').textContent=t('heroTitle');document.getElementById('miDesc').textContent=t('heroDesc');document.getElementById('tip1').textContent=lang==='ar'?'احفظ رقمك مرة واحدة — وسيظهر تلقائياً في المرة القادمة.':'Save your Employee ID once — it will load automatically next time.';document.getElementById('tip2').textContent=lang==='ar'?'حفظ الصورة ينتج بطاقة مرتبة بالتقويم والإحصائيات.':'Image export produces a clean card with calendar and stats.';document.getElementById('tip3').textContent=lang==='ar'?'استخدم تصدير ICS لإضافة المناوبات إلى تقويم Apple/Google/Outlook.':'Use ICS export to add shifts to Apple/Google/Outlook calendars.';document.getElementById('tipsOk').textContent='OK';var fc=document.getElementById('footerCredit');if(fc)fc.textContent=lang==='ar'?'تصميم: خالد الرقادي':'Design: KHALID ALRAQADI';if(data)renderSchedule();}
-  function toggleTheme(){theme=theme==='dark'?'light':'dark';document.body.classList.toggle('light',theme==='light');document.getElementById('themeBtn').textContent=theme==='dark'?'🌙':'☀️';localStorage.setItem('importPrefTheme',theme);}
-  function toggleLang(){lang=lang==='en'?'ar':'en';localStorage.setItem('importPrefLang',lang);applyLangUI();}
+  R.themeBtn.textContent=theme==='dark'?'🌙':'☀️';
+  function applyLangUI(){var L=T[lang],ar=lang==='ar';document.documentElement.lang=lang;document.documentElement.dir=ar?'rtl':'ltr';document.body.classList.toggle('ar',ar);R.ttl.textContent=L.title;R.sub.textContent=L.sub;R.langBtn.textContent=L.langBtn;R.empId.placeholder=L.ph;R.sbtn.textContent=L.sbtn;var e1=document.getElementById('e1'),e2=document.getElementById('e2');if(e1)e1.textContent=L.e1;if(e2)e2.textContent=L.e2;R.tipsTitleModal.textContent=L.tipsTitle;R.tipsSub.textContent=L.tipsSub;R.miTitle.textContent=L.heroTitle;R.miDesc.textContent=L.heroDesc;R.tip1.textContent=ar?'احفظ رقمك مرة واحدة — وسيظهر تلقائياً في المرة القادمة.':'Save your Employee ID once — it will load automatically next time.';R.tip2.textContent=ar?'حفظ الصورة ينتج بطاقة مرتبة بالتقويم والإحصائيات.':'Image export produces a clean card with calendar and stats.';R.tip3.textContent=ar?'استخدم تصدير ICS لإضافة المناوبات إلى تقويم Apple/Google/Outlook.':'Use ICS export to add shifts to Apple/Google/Outlook calendars.';R.tipsOk.textContent='OK';var fc=R.footerCredit;if(fc)fc.textContent=ar?'تصميم: خالد الرقادي':'Design: KHALID ALRAQADI';queueRender();}
+  function toggleTheme(){theme=theme==='dark'?'light':'dark';document.documentElement.dataset.theme=theme;R.themeBtn.textContent=theme==='dark'?'🌙':'☀️';localStorage.setItem('importPrefTheme',theme);}
+  function toggleLang(){var next=lang==='en'?'ar':'en';loadLang(next).then(function(){lang=next;localStorage.setItem('importPrefLang',lang);applyLangUI();}).catch(function(){});}
   function goBack(){var base=location.pathname.includes('/roster-site/')?'/roster-site':'';if(document.referrer&&document.referrer.includes(location.host))history.back();else location.href=base+'/import/';}
-  function openTips(){document.getElementById('tipsModal').classList.add('open');}
-  function closeTips(){document.getElementById('tipsModal').classList.remove('open');}
-  document.getElementById('searchForm').addEventListener('submit',function(e){e.preventDefault();var id=document.getElementById('empId').value.trim();if(id)loadSchedule(id);});
-  function codeToGroup(c){c=(c||'').toUpperCase().trim();if(!c||c==='O'||c==='OFF')return 'Off Day';if(c==='AL'||c.indexOf('ANNUAL')>=0)return 'Annual Leave';if(c==='SL'||c.indexOf('SICK')>=0)return 'Sick Leave';if(c==='TR'||c.indexOf('TRAIN')>=0)return 'Training';if(c.indexOf('STANDBY')>=0||c.startsWith('SB'))return 'Standby';if(c.startsWith('ST')&&c.length<=3)return 'Standby';if(c.startsWith('MN')||c.startsWith('ME'))return 'Morning';if(c.startsWith('AN')||c.startsWith('AE'))return 'Afternoon';if(c.startsWith('NN')||c.startsWith('NE'))return 'Night';return 'Other';}
-  async function loadSchedule(id){document.getElementById('area').innerHTML='<div class="state-view"><div class="spin"></div><div class="state-title">'+t('loading')+'</div></div>';try{var res=await fetch(schedulesUrl(id));if(!res.ok)throw new Error('not found');data=await res.json();if(!data.schedules&&data.days){var mk=data.month||(new Date().getFullYear()+'-'+String(new Date().getMonth()+1).padStart(2,'0'));data={id:data.id,name:data.name,department:data.department,schedules:{[mk]:data.days.map(function(d){return{day:d.day,shift_code:d.code,shift_group:codeToGroup(d.code)};})}};}months=Object.keys(data.schedules||{}).sort();if(!months.length)throw new Error('empty');if(!localStorage.getItem('importSavedEmpId'))showSaveToast(id);var now=new Date(),cur=now.getFullYear()+'-'+String(now.getMonth()+1).padStart(2,'0');month=months.indexOf(cur)>=0?cur:months[months.length-1];renderSchedule();}catch(e){document.getElementById('searchAvatarWrap').style.display='none';document.getElementById('area').innerHTML='<div class="state-view"><span class="state-emoji">❌</span><div class="state-title">'+t('notFound')+'</div><div class="state-desc">'+t('notFoundSub')+'</div></div>';}}
-  function showSaveToast(id){var m=document.getElementById('toastMount');m.style.display='flex';m.innerHTML='<div class="toast-card"><div class="toast-row"><div class="toast-ico">💾</div><div class="toast-text"><p><strong>'+(lang==='ar'?'هل تريد حفظ الرقم الوظيفي؟':'Save Employee ID?')+'</strong><br>'+t('saveSub')+'</p></div></div><div class="toast-btns"><button class="tbtn primary" onclick="confirmSave(\''+id+'\')">'+t('saveYes')+'</button><button class="tbtn" onclick="dismissToast()">'+t('saveNo')+'</button></div></div>';setTimeout(function(){dismissToast();},10000);}
-  function confirmSave(id){localStorage.setItem('importSavedEmpId',id);dismissToast();if(data)renderSchedule();}
-  function dismissToast(){var m=document.getElementById('toastMount');m.innerHTML='';m.style.display='none';}
+  function openTips(){R.tipsModal.classList.add('open');}
+  function closeTips(){R.tipsModal.classList.remove('open');}
+  document.getElementById('searchForm').addEventListener('submit',function(e){e.preventDefault();var id=R.empId.value.trim();if(id)loadSchedule(id);});
+  var CODE_GROUP=new Map([['','Off Day'],['O','Off Day'],['OFF','Off Day'],['AL','Annual Leave'],['SL','Sick Leave'],['TR','Training']]);
+  var CONTAINS_GROUP=[['ANNUAL','Annual Leave'],['SICK','Sick Leave'],['TRAIN','Training'],['STANDBY','Standby']];
+  var PREFIX_GROUP=[['SB','Standby',Infinity],['ST','Standby',3],['MN','Morning',Infinity],['ME','Morning',Infinity],['AN','Afternoon',Infinity],['AE','Afternoon',Infinity],['NN','Night',Infinity],['NE','Night',Infinity]];
+  var _groupMemo=new Map();
+  function _codeToGroup(u){var h=CODE_GROUP.get(u);if(h)return h;var i,e;for(i=0;i<CONTAINS_GROUP.length;i++){e=CONTAINS_GROUP[i];if(u.indexOf(e[0])>=0)return e[1];}for(i=0;i<PREFIX_GROUP.length;i++){e=PREFIX_GROUP[i];if(u.length<=e[2]&&u.startsWith(e[0]))return e[1];}return 'Other';}
+  function codeToGroup(c){c=c||'';var g=_groupMemo.get(c);if(g===undefined){g=_codeToGroup(c.toUpperCase().trim());_groupMemo.set(c,g);}return g;}
+  var _monthMemo=new Map();
+  function monthInfo(m){var mi=_monthMemo.get(m);if(!mi){var p=m.split('-'),y=+p[0],n=+p[1];mi={yr:y,mo:n,firstDow:new Date(y,n-1,1).getDay(),dim:new Date(y,n,0).getDate()};_monthMemo.set(m,mi);}return mi;}
+  function showState(tplId,title,desc){var f=R[tplId].content.cloneNode(true);f.querySelector('.state-title').textContent=title;var d=f.querySelector('.state-desc');if(d)d.textContent=desc||'';R.area.replaceChildren(f);}
+  var _inflight=null,_prefetched={};
+  function prefetchSchedule(id){if(_prefetched[id])return;_prefetched[id]=1;var l=document.createElement('link');l.rel='prefetch';l.as='fetch';l.crossOrigin='anonymous';l.href=schedulesUrl(id);document.head.appendChild(l);}
+  function prefetchTyped(){var id=R.empId.value.trim();if(/^[0-9]{4,}$/.test(id))prefetchSchedule(id);}
+  R.empId.addEventListener('blur',prefetchTyped);R.sbtn.addEventListener('pointerdown',prefetchTyped);
+  async function loadSchedule(id){if(_inflight)_inflight.abort();var ac=new AbortController();_inflight=ac;await langReady;if(ac!==_inflight)return;showState('tplStateLoading',t('loading'));try{var sk='importSched:'+SCHED_V+':'+id,hit=null,d;try{hit=sessionStorage.getItem(sk);}catch(e){}if(hit){d=JSON.parse(hit);}else{var res=await fetch(schedulesUrl(id),{signal:ac.signal});if(!res.ok)throw new Error('not found');var raw=await res.text();d=JSON.parse(raw);try{sessionStorage.setItem(sk,raw);}catch(e){}}if(ac!==_inflight)return;_inflight=null;data=d;if(!data.schedules&&data.days){var mk=data.month||(new Date().getFullYear()+'-'+String(new Date().getMonth()+1).padStart(2,'0'));data={id:data.id,name:data.name,department:data.department,schedules:{[mk]:data.days.map(function(d){return{day:d.day,shift_code:d.code,shift_group:codeToGroup(d.code)};})}};}months=data.months||Object.keys(data.schedules||{}).sort();var im=/(\S)\S*(?:\s+(\S))?/.exec(data.name||'');data.initials=im?(im[1]+(im[2]||'')).toUpperCase():'?';if(!months.length)throw new Error('empty');if(!localStorage.getItem('importSavedEmpId'))showSaveToast(id);var now=new Date(),cur=now.getFullYear()+'-'+String(now.getMonth()+1).padStart(2,'0');month=months.indexOf(cur)>=0?cur:months[months.length-1];renderSchedule();}catch(e){if(e.name==='AbortError'||(_inflight&&ac!==_inflight))return;R.searchAvatarWrap.style.display='none';showState('tplStateError',t('notFound'),t('notFoundSub'));}}
+  function showSaveToast(id){var m=R.toastMount;var f=R.tplToast.content.cloneNode(true);f.querySelector('.toast-title').textContent=lang==='ar'?'هل تريد حفظ الرقم الوظيفي؟':'Save Employee ID?';f.querySelector('.toast-sub').textContent=t('saveSub');var sb=f.querySelector('[data-action="save"]');sb.dataset.id=id;sb.textContent=t('saveYes');f.querySelector('[data-action="dismiss"]').textContent=t('saveNo');m.replaceChildren(f);m.style.display='flex';armToastTimer();document.addEventListener('visibilitychange',armToastTimer);}
+  var _toastTimer=0;
+  function armToastTimer(){clearTimeout(_toastTimer);_toastTimer=document.visibilityState==='visible'?setTimeout(dismissToast,10000):0;}
+  R.toastMount.addEventListener('click',function(e){var b=e.target.closest('[data-action]');if(!b)return;if(b.dataset.action==='save')confirmSave(b.dataset.id);else dismissToast();});
+  function confirmSave(id){localStorage.setItem('importSavedEmpId',id);dismissToast();queueRender();}
+  function dismissToast(){clearTimeout(_toastTimer);document.removeEventListener('visibilitychange',armToastTimer);var m=R.toastMount;m.replaceChildren();m.style.display='none';}
   function changeMyId(){openIdActionModal('change');}function setAsMyId(){openIdActionModal('pin');}
   var _pendingIdAction=null;
-  function openIdActionModal(kind){_pendingIdAction=kind;var m=document.getElementById('idActionModal');if(!m)return;document.getElementById('idActionTitle').textContent=t('idActTitle');document.getElementById('idActionIntroTitle').textContent=kind==='change'?t('idActChange'):t('idActPin');document.getElementById('idActionIntroDesc').textContent=kind==='change'?t('idActChangeSub'):t('idActPinSub');document.getElementById('idActionCancel').textContent=t('cancel');document.getElementById('idActionOk').textContent=t('ok');m.classList.add('open');}
-  function closeIdActionModal(){var m=document.getElementById('idActionModal');if(m)m.classList.remove('open');_pendingIdAction=null;}
-  function confirmIdAction(){if(_pendingIdAction==='change'){localStorage.removeItem('importSavedEmpId');closeIdActionModal();if(data)renderSchedule();}else if(_pendingIdAction==='pin'){if(data&&data.id)localStorage.setItem('importSavedEmpId',String(data.id));closeIdActionModal();if(data)renderSchedule();}else closeIdActionModal();}
-  function calcStats(s){var r={work:0,off:0,morning:0,afternoon:0,night:0,standby:0,leaves:0};s.forEach(function(d){var g=d.shift_group||codeToGroup(d.shift_code||'');if(g==='Morning')r.morning++;else if(g==='Afternoon')r.afternoon++;else if(g==='Night')r.night++;else if(g==='Off Day')r.off++;else if(g==='Standby')r.standby++;else if(g==='Annual Leave'||g==='Sick Leave')r.leaves++;});r.work=r.morning+r.afternoon+r.night;return r;}
+  function openIdActionModal(kind){_pendingIdAction=kind;var m=R.idActionModal;if(!m)return;R.idActionTitle.textContent=t('idActTitle');R.idActionIntroTitle.textContent=kind==='change'?t('idActChange'):t('idActPin');R.idActionIntroDesc.textContent=kind==='change'?t('idActChangeSub'):t('idActPinSub');R.idActionCancel.textContent=t('cancel');R.idActionOk.textContent=t('ok');m.classList.add('open');}
+  function closeIdActionModal(){var m=R.idActionModal;if(m)m.classList.remove('open');_pendingIdAction=null;}
+  function confirmIdAction(){if(_pendingIdAction==='change'){localStorage.removeItem('importSavedEmpId');closeIdActionModal();queueRender();}else if(_pendingIdAction==='pin'){if(data&&data.id)localStorage.setItem('importSavedEmpId',String(data.id));closeIdActionModal();queueRender();}else closeIdActionModal();}
+  var _groupCache=new WeakMap(),_classCache=new WeakMap();
+  function groupOf(d){var g=_groupCache.get(d);if(g===undefined){g=d.shift_group||codeToGroup(d.shift_code||'');_groupCache.set(d,g);}return g;}
+  function classOf(d){var c=_classCache.get(d);if(c===undefined){c=shiftClass(groupOf(d));_classCache.set(d,c);}return c;}
+  function calcStats(s){var r={work:0,off:0,morning:0,afternoon:0,night:0,standby:0,leaves:0};s.forEach(function(d){var g=groupOf(d);if(g==='Morning')r.morning++;else if(g==='Afternoon')r.afternoon++;else if(g==='Night')r.night++;else if(g==='Off Day')r.off++;else if(g==='Standby')r.standby++;else if(g==='Annual Leave'||g==='Sick Leave')r.leaves++;});r.work=r.morning+r.afternoon+r.night;return r;}
   function shiftClass(g){return{Morning:'s-morning',Afternoon:'s-afternoon',Night:'s-night','Off Day':'s-off','Annual Leave':'s-leave','Sick Leave':'s-leave',Training:'s-training',Standby:'s-standby',Other:'s-other'}[g]||'s-other';}
   function openStatsModal(){var el=document.getElementById('statsModalOverlay');if(el)el.style.display='flex';}
   function closeStatsModal(){var el=document.getElementById('statsModalOverlay');if(el)el.style.display='none';}
   document.addEventListener('keydown',function(e){if(e.key==='Escape'){closeTips();closeStatsModal();closeMonthPicker();}});
   function jumpMonth(val){if(months.indexOf(val)>=0){month=val;renderSchedule();}}
-  function toggleMonthPicker(){var p=document.getElementById('monthPopup');if(!p)return;p.style.cssText='';p.classList.toggle('open');if(p.classList.contains('open')){requestAnimationFrame(function(){var rect=p.getBoundingClientRect(),vw=window.innerWidth,margin=10;if(rect.right>vw-margin)p.style.transform='translateX(-'+(rect.right-(vw-margin))+'px)';else if(rect.left<margin)p.style.transform='translateX('+(margin-rect.left)+'px)';if(rect.bottom>window.innerHeight-margin){p.style.top='auto';p.style.bottom='calc(100% + 8px)';}});}}
-  function closeMonthPicker(){var p=document.getElementById('monthPopup');if(p)p.classList.remove('open');}
-  document.addEventListener('click',function(e){if(!e.target.closest('#mpBtn')&&!e.target.closest('#monthPopup'))closeMonthPicker();});
-  function renderSchedule(){var sched=data.schedules[month]||[];var parts=month.split('-');var yr=parseInt(parts[0]),mo=parseInt(parts[1]);var firstDow=new Date(yr,mo-1,1).getDay(),dim=new Date(yr,mo,0).getDate(),now=new Date();var mLabel=T[lang].months[mo-1];var popupHTML='<div class="month-popup-grid">'+months.map(function(m){var mm=parseInt(m.split('-')[1]);return '<div class="mp-item '+(m===month?'active':'')+'" onclick="jumpMonth(\''+m+'\');closeMonthPicker()">'+T[lang].months[mm-1]+'</div>';}).join('')+'</div>';var savedId=localStorage.getItem('importSavedEmpId');var isMyId=savedId===String(data.id);var initials=(data.name||'?').split(' ').slice(0,2).map(function(w){return w[0];}).join('').toUpperCase();var dayHdr=T[lang].days.map(function(d){return '<div>'+d+'</div>';}).join('');var cells='',dc=1;for(var w=0;w<6;w++){var rowHasDays=false;for(var d=0;d<7;d++){if(w===0&&d<firstDow){cells+='<div class="day empty"></div>';}else if(dc>dim){cells+='<div class="day empty"></div>';}else{rowHasDays=true;var dd=null;for(var i=0;i<sched.length;i++){if(sched[i].day===dc){dd=sched[i];break;}}var grp=dd?(dd.shift_group||codeToGroup(dd.shift_code||'')):'';var sc=grp?shiftClass(grp):'';var isToday=(now.getFullYear()===yr&&(now.getMonth()+1)===mo&&now.getDate()===dc);var code=dd?(dd.shift_code||(grp==='Off Day'?'OFF':grp==='Annual Leave'?'LV':grp==='Sick Leave'?'SL':grp==='Training'?'TR':grp==='Standby'?'ST':'')):'';var codeEl=code?'<span class="day-code">'+esc(code)+'</span>':'';cells+='<div class="day '+sc+(isToday?' today':'')+'"><span class="dnum">'+dc+'</span>'+codeEl+'</div>';dc++;}}if(dc>dim&&!rowHasDays)break;if(dc>dim)break;}var stats=calcStats(sched);var statsHTML=STAT_META.map(function(m){return '<div class="stat-card '+m.c+'"><span class="stat-ico">'+m.icon+'</span><div class="stat-val">'+stats[m.k]+'</div><div class="stat-lbl">'+(lang==='ar'?m.label_ar:m.label_en)+'</div></div>';}).join('');var avatarEl=document.getElementById('searchAvatar'),avatarWrap=document.getElementById('searchAvatarWrap'),chBtn=document.getElementById('searchChangeBtn');if(avatarEl)avatarEl.textContent=initials;if(avatarWrap)avatarWrap.style.display='flex';if(chBtn){if(isMyId){chBtn.textContent='✏️';chBtn.title='Change ID';chBtn.style.display='grid';chBtn.onclick=function(){changeMyId();};}else if(!savedId)chBtn.style.display='none';else{chBtn.textContent='📌';chBtn.title='Set as My ID';chBtn.style.display='grid';chBtn.onclick=function(){setAsMyId();};}}document.getElementById('area').innerHTML='<div id="exportArea" class="export-area"><div class="emp-banner"><div class="emp-info"><div class="emp-name-row"><div class="emp-name">'+esc(data.name)+'</div></div><div class="emp-dept">'+esc(data.department)+'</div></div><div class="emp-right"><div class="month-wrap"><button class="month-picker-btn" id="mpBtn" onclick="toggleMonthPicker()">'+esc(mLabel)+' <span class="mpb-arrow">▼</span></button><div class="month-popup" id="monthPopup">'+popupHTML+'</div></div></div></div><div class="cal-card"><div class="cal-head">'+dayHdr+'</div><div class="cal-body">'+cells+'</div></div></div><div class="actions-card"><div class="actions-grid"><button class="action-btn" onclick="dlPDF()"><span class="action-ico">📄</span>PDF</button><button class="action-btn" onclick="dlIMG()"><span class="action-ico">🖼️</span>'+(lang==='ar'?'صورة':'Image')+'</button><button class="action-btn" onclick="openStatsModal()"><span class="action-ico">📊</span>'+(lang==='ar'?'إحصائيات':'Stats')+'</button></div><div class="actions-grid" style="margin-top:8px"><button class="action-btn" onclick="dlICS()"><span class="action-ico">📆</span>ICS</button><button class="action-btn" onclick="shareS()"><span class="action-ico">🔗</span>'+(lang==='ar'?'مشاركة':'Share')+'</button><button class="action-btn" onclick="window.print()"><span class="action-ico">🖨️</span>'+(lang==='ar'?'طباعة':'Print')+'</button></div></div><div class="stats-modal-overlay" id="statsModalOverlay" onclick="closeStatsModal()" style="display:none"><div class="stats-modal" onclick="event.stopPropagation()"><div class="stats-modal-head"><span>'+(lang==='ar'?'الإحصائيات':'Statistics')+'</span><button onclick="closeStatsModal()" class="stats-modal-close">✕</button></div><div class="stats-modal-body">'+statsHTML+'</div></div></div>';}
-  async function captureExportCanvas(){var source=document.getElementById('exportArea')||document.querySelector('.main');if(!source)throw new Error('no export area');var clone=source.cloneNode(true);var wrap=document.createElement('div');wrap.style.cssText='position:fixed;left:-9999px;top:0;width:420px;padding:16px;box-sizing:border-box;';wrap.style.background=getComputedStyle(document.body).backgroundColor||'#0d1117';wrap.appendChild(clone);document.body.appendChild(wrap);await new Promise(function(r){requestAnimationFrame(r);});var canvas=await html2canvas(wrap,{scale:3,backgroundColor:null,useCORS:true});document.body.removeChild(wrap);return canvas;}
+  function toggleMonthPicker(){var p=document.getElementById('monthPopup');if(!p)return;p.style.cssText='';p.classList.toggle('open');if(!p.classList.contains('open')){document.removeEventListener('click',mpOutside);return;}document.addEventListener('click',mpOutside);requestAnimationFrame(function(){var rect=p.getBoundingClientRect(),vw=window.innerWidth,margin=10;if(rect.right>vw-margin)p.style.transform='translateX(-'+(rect.right-(vw-margin))+'px)';else if(rect.left<margin)p.style.transform='translateX('+(margin-rect.left)+'px)';if(rect.bottom>window.innerHeight-margin){p.style.top='auto';p.style.bottom='calc(100% + 8px)';}});}
+  function closeMonthPicker(){document.removeEventListener('click',mpOutside);var p=document.getElementById('monthPopup');if(p)p.classList.remove('open');}
+  function mpOutside(e){if(!e.target.closest('#mpBtn')&&!e.target.closest('#monthPopup'))closeMonthPicker();}
+  var _renderQueued=false;
+  function queueRender(){if(_renderQueued)return;_renderQueued=true;requestAnimationFrame(function(){_renderQueued=false;if(data)renderSchedule();});}
+  var ACTION_LBL={img:['Image','صورة'],stats:['Stats','إحصائيات'],share:['Share','مشاركة'],print:['Print','طباعة'],statsTitle:['Statistics','الإحصائيات']};
+  function mpPick(e){var it=e.target.closest('.mp-item');if(it){jumpMonth(it.dataset.month);closeMonthPicker();}}
+  var CODE_OF={'Off Day':'OFF','Annual Leave':'LV','Sick Leave':'SL','Training':'TR','Standby':'ST'};
+  var _mp=null,_stats=null;
+  function renderSchedule(){var sched=data.schedules[month]||[];var byDay=new Map();for(var i=0,n=sched.length;i<n;i++){if(!byDay.has(sched[i].day))byDay.set(sched[i].day,sched[i]);}var mi=monthInfo(month),yr=mi.yr,mo=mi.mo,firstDow=mi.firstDow,dim=mi.dim,now=new Date();var L=T[lang],M=L.months,li=lang==='ar'?1:0;var savedId=localStorage.getItem('importSavedEmpId');var isMyId=savedId===String(data.id);var root=R.tplSchedule.content.cloneNode(true);root.querySelector('.emp-name').textContent=data.name==null?'':data.name;root.querySelector('.emp-dept').textContent=data.department==null?'':data.department;root.querySelector('.mpb-label').textContent=M[mo-1];var grid=root.querySelector('.month-popup-grid');if(_mp&&_mp.months===months&&_mp.lang===lang){grid.replaceWith(_mp.grid);}else{var mpT=R.tplMpItem.content.firstElementChild,mpNodes=new Map();months.forEach(function(m){var it=mpT.cloneNode(false);it.dataset.month=m;it.textContent=M[monthInfo(m).mo-1];mpNodes.set(m,it);grid.appendChild(it);});grid.onclick=mpPick;_mp={months:months,lang:lang,grid:grid,nodes:mpNodes,active:null};}if(_mp.active)_mp.active.classList.remove('active');_mp.active=_mp.nodes.get(month)||null;if(_mp.active)_mp.active.classList.add('active');var head=root.querySelector('.cal-head');L.days.forEach(function(d){var h=document.createElement('div');h.textContent=d;head.appendChild(h);});var body=root.querySelector('.cal-body'),dayT=R.tplDay.content.firstElementChild,emptyT=document.createElement('div');emptyT.className='day empty';var todayDc=(now.getFullYear()===yr&&now.getMonth()+1===mo)?now.getDate():0,nCells=Math.min(42,Math.ceil((firstDow+dim)/7)*7);for(var idx=0;idx<nCells;idx++){var dc=idx-firstDow+1;if(dc<1||dc>dim){body.appendChild(emptyT.cloneNode(false));}else{var dd=byDay.get(dc)||null;var grp=dd?groupOf(dd):'';var sc=grp?classOf(dd):'';var code=dd?(dd.shift_code||CODE_OF[grp]||''):'';var cell=dayT.cloneNode(true);cell.className='day '+sc+(dc===todayDc?' today':'');cell.firstChild.textContent=dc;if(code){var ce=document.createElement('span');ce.className='day-code';ce.textContent=code;cell.appendChild(ce);}body.appendChild(cell);}}var stats=calcStats(sched),sb=root.querySelector('.stats-modal-body');if(_stats&&_stats.li===li){sb.replaceWith(_stats.body);}else{var statT=R.tplStat.content.firstElementChild,vals=[];STAT_META.forEach(function(m){var c=statT.cloneNode(true);c.className='stat-card '+m.c;c.children[0].textContent=m.icon;c.children[2].textContent=li?m.label_ar:m.label_en;vals.push(c.children[1]);sb.appendChild(c);});_stats={li:li,body:sb,vals:vals};}for(var si=0;si<STAT_META.length;si++)_stats.vals[si].textContent=stats[STAT_META[si].k];root.querySelectorAll('[data-lbl]').forEach(function(el){el.textContent=ACTION_LBL[el.dataset.lbl][li];});var avatarEl=R.searchAvatar,avatarWrap=R.searchAvatarWrap,chBtn=R.searchChangeBtn;if(avatarEl)avatarEl.textContent=data.initials;if(avatarWrap)avatarWrap.style.display='flex';if(chBtn){if(isMyId){chBtn.textContent='✏️';chBtn.title='Change ID';chBtn.style.display='grid';chBtn.onclick=function(){changeMyId();};}else if(!savedId)chBtn.style.display='none';else{chBtn.textContent='📌';chBtn.title='Set as My ID';chBtn.style.display='grid';chBtn.onclick=function(){setAsMyId();};}}R.area.replaceChildren(root);}
+  var H2C_SRC='https://cdnjs.cloudflare.com/ajax/libs/html2canvas/1.4.1/html2canvas.min.js',JSPDF_SRC='https://cdnjs.cloudflare.com/ajax/libs/jspdf/2.5.1/jspdf.umd.min.js',_scripts={};
+  function loadScript(u){if(!_scripts[u])_scripts[u]=new Promise(function(res,rej){var s=document.createElement('script');s.src=u;s.async=true;s.onload=res;s.onerror=function(e){delete _scripts[u];s.remove();rej(e);};document.head.appendChild(s);});return _scripts[u];}
+  var _exportCanvas=null;
+  async function captureExportCanvas(opts){var sc=opts&&opts.scale||Math.min(window.devicePixelRatio||1,2);var key=[data.id,month,lang,document.documentElement.dataset.theme,sc].join('|');if(_exportCanvas&&_exportCanvas.key===key)return _exportCanvas.canvas;await loadScript(H2C_SRC);var source=document.getElementById('exportArea')||document.querySelector('.main');if(!source)throw new Error('no export area');var clone=source.cloneNode(true);var wrap=document.createElement('div');wrap.style.cssText='position:fixed;left:-9999px;top:0;width:420px;padding:16px;box-sizing:border-box;';wrap.style.background=getComputedStyle(document.body).backgroundColor||'#0d1117';wrap.appendChild(clone);document.body.appendChild(wrap);await new Promise(function(r){requestAnimationFrame(r);});var canvas=await html2canvas(wrap,{scale:sc,backgroundColor:null,useCORS:true,logging:false,imageTimeout:0,removeContainer:true});document.body.removeChild(wrap);_exportCanvas={key:key,canvas:canvas};return canvas;}
   async function dlIMG(){try{var canvas=await captureExportCanvas();var a=document.createElement('a');a.download='import-'+data.id+'-'+month+'.png';a.href=canvas.toDataURL('image/png');a.click();}catch(e){alert(lang==='ar'?'تعذر حفظ الصورة.':'Image export failed.');}}
-  async function dlPDF(){try{var canvas=await captureExportCanvas();var imgData=canvas.toDataURL('image/png');var jsPDF=window.jspdf.jsPDF;var pdf=new jsPDF({orientation:'portrait',unit:'mm',format:'a4'});var pageW=210,pageH=297,margin=10,imgW=pageW-margin*2,imgH=(canvas.height*imgW)/canvas.width;pdf.addImage(imgData,'PNG',margin,margin,imgW,imgH);var rem=imgH-(pageH-margin*2);while(rem>0){pdf.addPage();pdf.addImage(imgData,'PNG',margin,margin-(imgH-rem),imgW,imgH);rem-=(pageH-margin*2);}pdf.save('import-'+data.id+'-'+month+'.pdf');}catch(e){alert(lang==='ar'?'تعذر حفظ PDF.':'PDF export failed.');}}
-  function dlICS(){var sched=data.schedules[month]||[];var parts=month.split('-');var yr=parseInt(parts[0]),mo=parseInt(parts[1]);var pad=function(n){return String(n).padStart(2,'0');};var now=new Date();var dtstamp=now.getUTCFullYear()+''+pad(now.getUTCMonth()+1)+''+pad(now.getUTCDate())+'T'+pad(now.getUTCHours())+''+pad(now.getUTCMinutes())+''+pad(now.getUTCSeconds())+'Z';var cal=['BEGIN:VCALENDAR','VERSION:2.0','PRODID:-//ImportMySchedule//App//EN','CALSCALE:GREGORIAN','METHOD:PUBLISH'];sched.forEach(function(d){var dt2=yr+''+pad(mo)+''+pad(d.day);var dn=new Date(yr,mo-1,d.day+1);var dtE=dn.getFullYear()+''+pad(dn.getMonth()+1)+''+pad(dn.getDate());var s=(d.shift_code||d.shift_group||'').replace(/[\r\n,;]/g,' ');cal.push('BEGIN:VEVENT','UID:'+dt2+'-'+data.id+'@importschedule','DTSTAMP:'+dtstamp,'DTSTART;VALUE=DATE:'+dt2,'DTEND;VALUE=DATE:'+dtE,'SUMMARY:'+s,'DESCRIPTION:Shift '+s,'STATUS:CONFIRMED','TRANSP:OPAQUE','END:VEVENT');});cal.push('END:VCALENDAR');var ics=cal.join('\r\n');var fname='import-'+data.id+'-'+month+'.ics';var isIOS=/iPad|iPhone|iPod/.test(navigator.userAgent)&&!window.MSStream;if(isIOS){window.location.href='data:text/calendar;charset=utf-8,'+encodeURIComponent(ics);return;}var blob=new Blob([ics],{type:'text/calendar;charset=utf-8'});var file=new File([blob],fname,{type:'text/calendar'});if(navigator.canShare&&navigator.canShare({files:[file]})){navigator.share({files:[file],title:fname}).catch(function(){_dlBlob(blob,fname);});return;}_dlBlob(blob,fname);}  function _dlBlob(blob,fname){var url=URL.createObjectURL(blob);var a=document.createElement('a');a.href=url;a.download=fname;document.body.appendChild(a);a.click();document.body.removeChild(a);setTimeout(function(){URL.revokeObjectURL(url);},5000);}
+  async function dlPDF(){try{var pdfLib=loadScript(JSPDF_SRC);pdfLib.catch(function(){});var canvas=await captureExportCanvas({scale:2});await pdfLib;var jsPDF=window.jspdf.jsPDF;var pdf=new jsPDF({orientation:'portrait',unit:'mm',format:'a4'});var pageW=210,pageH=297,margin=10,imgW=pageW-margin*2,pxPerPage=Math.floor(canvas.width*(pageH-margin*2)/imgW);var tile=document.createElement('canvas');tile.width=canvas.width;for(var y=0;y<canvas.height;y+=pxPerPage){var h=Math.min(pxPerPage,canvas.height-y);tile.height=h;tile.getContext('2d').drawImage(canvas,0,-y);if(y)pdf.addPage();pdf.addImage(tile.toDataURL('image/png'),'PNG',margin,margin,imgW,(h*imgW)/canvas.width);}tile.width=0;pdf.save('import-'+data.id+'-'+month+'.pdf');}catch(e){alert(lang==='ar'?'تعذر حفظ PDF.':'PDF export failed.');}}
+  function pad(n){return(n<10?'0':'')+n;}
+  function dlICS(){var sched=data.schedules[month]||[];var mi=monthInfo(month),yr=mi.yr,mo=mi.mo;var now=new Date();var dtstamp=now.getUTCFullYear()+''+pad(now.getUTCMonth()+1)+''+pad(now.getUTCDate())+'T'+pad(now.getUTCHours())+''+pad(now.getUTCMinutes())+''+pad(now.getUTCSeconds())+'Z';var NL='\r\n',ym=yr+pad(mo);var ics='BEGIN:VCALENDAR'+NL+'VERSION:2.0'+NL+'PRODID:-//ImportMySchedule//App//EN'+NL+'CALSCALE:GREGORIAN'+NL+'METHOD:PUBLISH';for(var i=0,n=sched.length;i<n;i++){var d=sched[i],dt2=ym+pad(d.day),dn=new Date(yr,mo-1,d.day+1),s=(d.shift_code||d.shift_group||'').replace(/[\r\n,;]/g,' ');ics+=NL+'BEGIN:VEVENT'+NL+'UID:'+dt2+'-'+data.id+'@importschedule'+NL+'DTSTAMP:'+dtstamp+NL+'DTSTART;VALUE=DATE:'+dt2+NL+'DTEND;VALUE=DATE:'+dn.getFullYear()+pad(dn.getMonth()+1)+pad(dn.getDate())+NL+'SUMMARY:'+s+NL+'DESCRIPTION:Shift '+s+NL+'STATUS:CONFIRMED'+NL+'TRANSP:OPAQUE'+NL+'END:VEVENT';}ics+=NL+'END:VCALENDAR';var fname='import-'+data.id+'-'+month+'.ics';var isIOS=/iPad|iPhone|iPod/.test(navigator.userAgent)&&!window.MSStream;if(isIOS){window.location.href='data:text/calendar;charset=utf-8,'+encodeURIComponent(ics);return;}var blob=new Blob([ics],{type:'text/calendar;charset=utf-8'});var file=new File([blob],fname,{type:'text/calendar'});if(navigator.canShare&&navigator.canShare({files:[file]})){navigator.share({files:[file],title:fname}).catch(function(){_dlBlob(blob,fname);});return;}_dlBlob(blob,fname);}  function _dlBlob(blob,fname){var url=URL.createObjectURL(blob);var a=document.createElement('a');a.href=url;a.download=fname;document.body.appendChild(a);a.click();document.body.removeChild(a);setTimeout(function(){URL.revokeObjectURL(url);},5000);}
   function shareS(){var base=location.pathname.includes('/roster-site/')?'/roster-site':'';var url=location.origin+base+'/import/my-schedules/?emp='+encodeURIComponent(data.id);if(navigator.share)navigator.share({title:'Import - My Schedule',text:'Schedule: '+data.name,url:url});else{navigator.clipboard.writeText(url);alert(lang==='ar'?'تم نسخ الرابط ✅':'Link copied ✅');}}
-  (function(){var cal=document.getElementById('brandCal'),q=document.getElementById('brandQ');if(!cal||!q)return;var sc=true;setInterval(function(){sc=!sc;cal.classList.toggle('show',sc);q.classList.toggle('show',!sc);},2600);})();
-  (function(){var topbar=document.querySelector('.topbar'),aI=document.getElementById('auroraBarInner'),aB=document.getElementById('auroraBar');if(!topbar)return;function sp(){var h=topbar.offsetHeight||62;if(aB)aB.style.top=h+'px';}window.addEventListener('scroll',function(){if(aI)aI.classList.toggle('visible',window.scrollY>5);},{passive:true});setTimeout(sp,100);window.addEventListener('resize',sp);})();
+  (function(){var cal=document.getElementById('brandCal'),q=document.getElementById('brandQ');if(!cal||!q)return;var sc=true;function tick(){if(document.visibilityState==='visible'){sc=!sc;cal.classList.toggle('show',sc);q.classList.toggle('show',!sc);}setTimeout(function(){requestAnimationFrame(tick);},2600);}setTimeout(function(){requestAnimationFrame(tick);},2600);})();
+  (function(){var topbar=document.querySelector('.topbar'),aI=document.getElementById('auroraBarInner'),aB=document.getElementById('auroraBar');if(!topbar)return;function sp(){var h=topbar.offsetHeight||62;if(aB)aB.style.top=h+'px';}var pending=false,shown=false;window.addEventListener('scroll',function(){if(!aI||pending)return;pending=true;requestAnimationFrame(function(){pending=false;var v=window.scrollY>5;if(v!==shown){shown=v;aI.classList.toggle('visible',v);}});},{passive:true});setTimeout(sp,100);window.addEventListener('resize',sp);})();
+  langReady.then(function(){
   applyLangUI();
   var p=new URLSearchParams(location.search).get('emp');
-  if(p){document.getElementById('empId').value=p;loadSchedule(p);}
-  else{var saved=localStorage.getItem('importSavedEmpId');if(saved){document.getElementById('empId').value=saved;loadSchedule(saved);}}
+  if(p){R.empId.value=p;loadSchedule(p);}
+  else{var saved=localStorage.getItem('importSavedEmpId');if(saved){R.empId.value=saved;loadSchedule(saved);}}
+  });
 </script>
 </body>
 </html>"""
+    # العربية (اللغة الافتراضية) مضمّنة في الصفحة؛ الإنجليزية فقط تُحمَّل من i18n/en.json عند اختيارها
+    i18n_ar = json.dumps(MY_SCHEDULE_I18N["ar"], ensure_ascii=False, separators=(",", ":")).replace("</", "<\\/")
+    return html.replace("__SCHED_V__", schedules_version).replace("__I18N_AR__", i18n_ar)
+
+
+
+# نصوص صفحة My Schedule — ar مضمّنة في الصفحة، و en تُكتب إلى docs/import/i18n/en.json وتُحمَّل عند الحاجة
+MY_SCHEDULE_I18N: Dict[str, Dict[str, Any]] = {
+    "en": {
+        "title": "Import - My Schedule",
+        "sub": "Enter your Employee ID",
+        "heroTitle": "Your Import roster in one view",
+        "heroDesc": "Enter your Employee ID to view the month, export as PDF, Image, or add to your calendar.",
+        "tipsTitle": "Help & Tips",
+        "tipsSub": "Quick help for using the roster.",
+        "langBtn": "ع",
+        "ph": "e.g. 12345",
+        "sbtn": "📅 View",
+        "loading": "Loading…",
+        "notFound": "Employee not found",
+        "notFoundSub": "ID not in the system. Please check and try again.",
+        "e1": "Search your schedule",
+        "e2": "Enter your Employee ID above to view your monthly Import roster.",
+        "saveSub": "Open your schedule faster next time.",
+        "saveYes": "✅ Save",
+        "saveNo": "Not now",
+        "idActTitle": "Employee ID",
+        "idActChange": "Change saved ID?",
+        "idActChangeSub": "This will remove the saved ID from this device.",
+        "idActPin": "Set as My ID?",
+        "idActPinSub": "Save this ID on this device for faster access.",
+        "cancel": "Cancel",
+        "ok": "OK",
+        "days": [
+            "Sunday", "Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday",
+        ],
+        "months": [
+            "January", "February", "March", "April", "May", "June", "July", "August",
+            "September", "October", "November", "December",
+        ],
+    },
+    "ar": {
+        "title": "الوارد - جدولي",
+        "sub": "أدخل رقمك الوظيفي",
+        "heroTitle": "جدول الوارد في عرض واحد",
+        "heroDesc": "أدخل رقمك الوظيفي لعرض الشهر، ثم حمّل PDF/صورة أو أضفه للتقويم.",
+        "tipsTitle": "مساعدة ونصائح",
+        "tipsSub": "مساعدة سريعة لاستخدام الجدول.",
+        "langBtn": "EN",
+        "ph": "مثال: 12345",
+        "sbtn": "📅 عرض",
+        "loading": "جاري التحميل…",
+        "notFound": "لم يُعثر على موظف",
+        "notFoundSub": "الرقم غير موجود في النظام. تحقق وأعد المحاولة.",
+        "e1": "ابحث عن جدولك",
+        "e2": "أدخل رقمك الوظيفي أعلاه لعرض مناوبات الوارد.",
+        "saveSub": "لفتح الجدول بسرعة في المرات القادمة.",
+        "saveYes": "✅ احفظ",
+        "saveNo": "ليس الآن",
+        "idActTitle": "الرقم الوظيفي",
+        "idActChange": "هل تريد حذف الرقم الوظيفي؟",
+        "idActChangeSub": "سيتم حذف الرقم المحفوظ من هذا الجهاز نهائياً.",
+        "idActPin": "هل تريد حفظ الرقم الوظيفي؟",
+        "idActPinSub": "سيتم حفظ هذا الرقم على هذا الجهاز لفتح الجدول بسرعة.",
+        "cancel": "إلغاء",
+        "ok": "موافق",
+        "days": [
+            "الأحد", "الاثنين", "الثلاثاء", "الأربعاء", "الخميس", "الجمعة", "السبت",
+        ],
+        "months": [
+            "يناير", "فبراير", "مارس", "أبريل", "مايو", "يونيو", "يوليو", "أغسطس",
+            "سبتمبر", "أكتوبر", "نوفمبر", "ديسمبر",
+        ],
+    },
+}
+
+
+def build_my_schedule_css() -> str:
+    """
+    Non-critical styles for the Import My Schedule page (stats, actions, modals, toasts).
+    Written to docs/import/roster.css and loaded async; the calendar grid and shift
+    colours stay inline in build_my_schedule_html so a cached schedule paints styled.
+    """
+    return r""".stat-card{background:var(--surface);border:1px solid var(--border);border-radius:var(--r);padding:16px 8px 14px;text-align:center;position:relative;overflow:hidden;transition:border-color .2s,transform .15s,box-shadow .15s;}
+.stat-card:hover{border-color:var(--border2);transform:translateY(-2px);box-shadow:0 8px 24px rgba(0,0,0,.3);}
+.stat-card::after{content:'';position:absolute;top:0;left:0;right:0;height:3px;}
+.stat-card.c-blue::after{background:linear-gradient(90deg,#1f6feb,#58a6ff)}.stat-card.c-gray::after{background:linear-gradient(90deg,#484f58,#8b949e)}.stat-card.c-amber::after{background:linear-gradient(90deg,#b45309,#d29922)}.stat-card.c-orange::after{background:linear-gradient(90deg,#c2410c,#db6d28)}.stat-card.c-purple::after{background:linear-gradient(90deg,#7c3aed,#bc8cff)}.stat-card.c-pink::after{background:linear-gradient(90deg,#be185d,#ff7b72)}.stat-card.c-green::after{background:linear-gradient(90deg,#15803d,#3fb950)}
+.stat-ico{font-size:18px;margin-bottom:6px;display:block}.stat-val{font-size:24px;font-weight:800;color:var(--ink);font-family:'DM Mono',monospace;line-height:1}.stat-lbl{font-size:9.5px;color:var(--muted);font-weight:600;margin-top:5px;line-height:1.3}
+.actions-card{background:var(--surface);border:1px solid var(--border);border-radius:var(--r-lg);padding:14px;display:flex;flex-direction:column;gap:8px;content-visibility:auto;contain-intrinsic-size:auto 132px;}
+.actions-grid{display:grid;grid-template-columns:repeat(3,1fr);gap:10px;}
+.action-btn{display:flex;align-items:center;justify-content:center;gap:8px;color:#58a6ff!important;font-weight:700!important;background:linear-gradient(135deg,rgba(31,111,235,.18),rgba(56,139,253,.10))!important;border:1px solid rgba(56,139,253,.35)!important;border-radius:10px;padding:12px 10px;font-size:13px;transition:all .15s;min-height:48px;position:relative;backdrop-filter:blur(14px) saturate(170%);-webkit-backdrop-filter:blur(14px) saturate(170%);}
+.action-btn:hover{color:#79b8ff!important;background:linear-gradient(135deg,rgba(31,111,235,.30),rgba(56,139,253,.20))!important;border-color:rgba(56,139,253,.6)!important;transform:translateY(-1px);}
+.action-btn:active{transform:scale(.98)}.action-ico{font-size:16px;flex:0 0 auto}
+.stats-modal-overlay{position:fixed;inset:0;background:rgba(0,0,0,.6);backdrop-filter:blur(4px);z-index:500;display:flex;align-items:center;justify-content:center;padding:20px;animation:fadeIn .15s ease;}
+.stats-modal{background:var(--surface);border:1px solid var(--border2);border-radius:var(--r-lg);width:100%;max-width:560px;box-shadow:0 24px 64px rgba(0,0,0,.5);animation:popIn .2s cubic-bezier(.22,1,.36,1);overflow:hidden;will-change:transform,opacity;}
+.stats-modal-head{display:flex;align-items:center;justify-content:space-between;padding:14px 16px;border-bottom:1px solid var(--border);font-size:14px;font-weight:700;color:var(--ink);}
+.stats-modal-close{width:28px;height:28px;background:rgba(255,255,255,.06);border:1px solid var(--border2);border-radius:7px;color:var(--muted);font-size:12px;display:grid;place-items:center;cursor:pointer;transition:all .15s;}
+.stats-modal-close:hover{background:rgba(255,255,255,.12);color:var(--ink)}
+.stats-modal-body{padding:16px;display:grid;grid-template-columns:repeat(4,1fr);gap:10px;}
+@media(max-width:400px){.stats-modal-body{grid-template-columns:repeat(2,1fr)}}
+.modal-backdrop{position:absolute;inset:0;background:rgba(0,0,0,.7);backdrop-filter:blur(8px);-webkit-backdrop-filter:blur(8px);}
+.modal-sheet{position:relative;z-index:1;width:100%;max-width:540px;background:var(--surface);border:1px solid var(--border2);border-radius:24px 24px 0 0;overflow:hidden;animation:slideUp .25s cubic-bezier(.22,1,.36,1);max-height:85dvh;display:flex;flex-direction:column;}
+.modal.open .modal-sheet{will-change:transform,opacity;}
+@media(min-width:600px){.modal-sheet{border-radius:20px;max-width:560px}}
+.modal-handle{width:40px;height:4px;background:var(--dim);border-radius:2px;margin:14px auto 0;opacity:.5}
+.modal-head{padding:18px 22px 16px;border-bottom:1px solid var(--border);display:flex;align-items:flex-start;justify-content:space-between;gap:12px;}
+.modal-title{font-size:18px;font-weight:700;color:var(--ink)}.modal-sub{font-size:13px;color:var(--muted);margin-top:4px;line-height:1.5}
+.modal-close{width:36px;height:36px;border-radius:10px;background:rgba(255,255,255,.06);border:1px solid var(--border);color:var(--muted);font-size:16px;display:grid;place-items:center;flex:0 0 auto;transition:all .15s;}
+.modal-close:hover{background:rgba(255,255,255,.12);color:var(--ink)}
+.modal-body{overflow:auto;-webkit-overflow-scrolling:touch;padding:18px 22px;}
+.modal-intro{background:rgba(88,166,255,.05);border:1px solid rgba(88,166,255,.15);border-radius:12px;padding:14px 16px;margin-bottom:14px;}
+.modal-intro-title{font-size:14px;font-weight:700;color:var(--ink);margin-bottom:5px}.modal-intro-desc{font-size:13px;color:var(--muted);line-height:1.65}
+.tip{display:flex;align-items:flex-start;gap:12px;padding:14px;border:1px solid var(--border);border-radius:12px;background:rgba(255,255,255,.02);}.tip+.tip{margin-top:10px}
+.tip-ico{font-size:20px;flex:0 0 auto;margin-top:1px}.tip-text{font-size:13px;color:var(--muted);line-height:1.65;font-weight:500}
+.modal-foot{position:sticky;bottom:0;background:linear-gradient(to bottom,rgba(0,0,0,0),rgba(0,0,0,.22));backdrop-filter:blur(10px);border-top:1px solid var(--border);padding:16px 22px calc(16px + var(--safe-bot));display:flex;justify-content:flex-end;}
+html[data-theme="light"] .modal-foot{background:linear-gradient(to bottom,rgba(255,255,255,0),rgba(255,255,255,.75));}
+.ok-btn{height:40px;padding:0 20px;background:linear-gradient(135deg,#1f6feb,#388bfd);border:none;color:#fff;border-radius:10px;font-size:13px;font-weight:700;transition:filter .15s;}
+.ok-btn:hover{filter:brightness(1.1)}
+.tbtn{flex:1;height:36px;border-radius:8px;font-size:12px;font-weight:700;border:1px solid var(--border2);background:rgba(255,255,255,.05);color:var(--muted);transition:all .12s;}
+.tbtn:hover{background:rgba(255,255,255,.1);color:var(--ink)}.tbtn.primary{background:linear-gradient(135deg,#1f6feb,#388bfd);border:none;color:#fff;}
+.tbtn.primary:hover{filter:brightness(1.1)}
+.toast-container{position:fixed;inset:0;z-index:9999;display:flex;align-items:center;justify-content:center;pointer-events:none;padding:20px;background:rgba(0,0,0,.45);backdrop-filter:blur(4px);}
+.toast-card{pointer-events:auto;width:min(400px,100%);background:var(--surface);border:1px solid rgba(56,139,253,.25);border-radius:20px;padding:20px;box-shadow:0 24px 64px rgba(0,0,0,.7);animation:slideUp .22s cubic-bezier(.22,1,.36,1);will-change:transform,opacity;}
+.toast-row{display:flex;align-items:flex-start;gap:10px}
+.toast-ico{width:38px;height:38px;border-radius:10px;background:rgba(88,166,255,.1);border:1px solid rgba(88,166,255,.2);display:grid;place-items:center;font-size:16px;flex:0 0 auto;}
+.toast-text p{font-size:12.5px;color:var(--muted);line-height:1.55;font-weight:500}.toast-text strong{color:var(--ink)}
+.toast-btns{display:flex;gap:8px;margin-top:10px}
+@media(prefers-reduced-transparency:reduce){.action-btn,.modal-foot,.modal-backdrop,.toast-container,.stats-modal-overlay{backdrop-filter:none;-webkit-backdrop-filter:none}.action-btn{background:linear-gradient(135deg,rgba(31,111,235,.22),rgba(56,139,253,.14))!important}}
+.lowfx .action-btn,.lowfx .modal-foot,.lowfx .modal-backdrop,.lowfx .toast-container,.lowfx .stats-modal-overlay{backdrop-filter:none;-webkit-backdrop-filter:none}
+.lowfx .action-btn{background:linear-gradient(135deg,rgba(31,111,235,.22),rgba(56,139,253,.14))!important}
+"""
 
 
 
 def build_employee_month_entries(parsed: Dict[str, Any], emp: Dict[str, Any]) -> List[Dict[str, Any]]:
     """Return a list of day entries for a single month."""
-    year = parsed["year"]
-    month = parsed["month"]
+    key = (parsed["year"], parsed["month"])
+    # أيام الشهر الصالحة تُحسب مرة لكل شهر وتُشارك بين كل الموظفين
+    # (المفتاح يحمي من تغيير السنة/الشهر بعد parse_month_sheet)
+    cached = parsed.get("_valid_days")
+    if cached is None or cached[0] != key:
+        dim = _dim(*key)
+        cached = (key, [d for d in sorted(parsed["date_cols"]) if 1 <= d <= dim])
+        parsed["_valid_days"] = cached
     out: List[Dict[str, Any]] = []
-    for d in sorted(parsed["date_cols"].keys()):
-        try:
-            dt.date(year, month, d)  # validate
-        except ValueError:
-            continue
+    for d in cached[1]:
         code = emp["shifts"].get(d, "")
         if not code:
             continue
@@ -1393,11 +1645,18 @@ def main() -> None:
 
     source_name_url = os.getenv("IMPORT_SOURCE_NAME_URL", "").strip()
 
+    tmp_dir = repo_root / ".tmp_import"
+    tmp_dir.mkdir(exist_ok=True)
+
     # ── 1. تحميل الملف من OneDrive ──────────────────────────────
+    # يُكتب مباشرة إلى القرص ويُحسب الـ sha256 في نفس المرور
     data: bytes | None = None
+    download_path = tmp_dir / "download.xlsx"
+    excel_sha256 = ""
     try:
-        data = download_excel(url)
-        print("✅ Excel downloaded successfully")
+        excel_sha256 = download_excel(url, download_path)
+        data = download_path.read_bytes()
+        print(f"✅ Excel downloaded successfully (sha256 {excel_sha256[:12]})")
     except Exception as e:
         print(f"WARNING: Could not download Excel: {e}")
         print("Will attempt to use cached rosters...")
@@ -1421,20 +1680,25 @@ def main() -> None:
     # ── 4. حفظ في الكاش إذا نجح التحميل ────────────────────────
     # المنطق: نمسح كل الشيتات في الملف ونكاش كل شيت له اسم شهر.
     # لا نعتمد على incoming_key كبوابة — الملف قد يحتوي شهرين بدون اسم شهر في اسم الملف.
+    # نفس الملف (نفس الـ sha256) مكاش مسبقاً؟ لا نعيد نسخه — يتجنب تغييرات git بلا معنى
+    def refresh_cached_xlsx(xlsx_cache: Path, meta_cache: Path) -> None:
+        try:
+            if xlsx_cache.exists() and json.loads(meta_cache.read_text(encoding="utf-8")).get("sha256") == excel_sha256:
+                return
+        except Exception:
+            pass
+        shutil.copyfile(download_path, xlsx_cache)
+
     if data:
-        import tempfile
         cached_keys_from_sheets: List[str] = []
         try:
-            with tempfile.NamedTemporaryFile(suffix=".xlsx", delete=False) as tf:
-                tf.write(data)
-                tf_path = tf.name
-            xls_check = pd.ExcelFile(tf_path)
+            tf_path = str(download_path)
+            all_sheet_names, _, _ = sheet_index(tf_path)
             now_str = dt.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
             # تتبع الشيتات المُكاشَة: sn_key -> sheet_name (لتجنب تعارض شهرين)
             cached_keys_this_run: dict = {}  # sn_key -> sheet_name
 
-            all_sheet_names = xls_check.sheet_names
             for sheet_idx, sn in enumerate(all_sheet_names):
                 # الأولوية 1: اسم الشيت يحتوي اسم الشهر
                 sn_key = month_key_from_filename(sn)
@@ -1491,12 +1755,13 @@ def main() -> None:
                     cached_keys_from_sheets.append(sn_key)  # نعدّه موجوداً من الكاش القديم
                     continue
 
-                xlsx_cache.write_bytes(data)
+                refresh_cached_xlsx(xlsx_cache, meta_cache)
                 meta_cache.write_text(json.dumps({
                     "month_key": sn_key,
                     "original_filename": source_name,
                     "sheet_name": sn,
                     "downloaded_at": now_str,
+                    "sha256": excel_sha256,
                 }, ensure_ascii=False, indent=2), encoding="utf-8")
                 cached_keys_from_sheets.append(sn_key)
                 if confirmed_by_content:
@@ -1504,17 +1769,17 @@ def main() -> None:
                 else:
                     print(f"  ✅ Cached sheet '{sn}' → {sn_key}.xlsx (كاش جديد بالتخمين)")
 
-            Path(tf_path).unlink(missing_ok=True)
 
             # لو لم تُكتشَف أي شيتات بشهر، ارجع لـ incoming_key كحل أخير
             if not cached_keys_from_sheets and incoming_key:
                 xlsx_cache = cache_dir / f"{incoming_key}.xlsx"
                 meta_cache = cache_dir / f"{incoming_key}.meta.json"
-                xlsx_cache.write_bytes(data)
+                refresh_cached_xlsx(xlsx_cache, meta_cache)
                 meta_cache.write_text(json.dumps({
                     "month_key": incoming_key,
                     "original_filename": source_name,
                     "downloaded_at": now_str,
+                    "sha256": excel_sha256,
                 }, ensure_ascii=False, indent=2), encoding="utf-8")
                 cached_keys_from_sheets.append(incoming_key)
                 print(f"  ✅ Cached (filename fallback) → {incoming_key}.xlsx")
@@ -1547,7 +1812,6 @@ def main() -> None:
 
     # ── 5b. حذف صفحات التواريخ التي لا تنتمي للأشهر الثلاثة ─────────
     allowed_prefixes = {prev_key, curr_key, next_key}
-    import shutil
     for date_dir in out_root.glob("2[0-9][0-9][0-9]-[0-9][0-9]-[0-9][0-9]"):
         if date_dir.is_dir():
             folder_month = date_dir.name[:7]  # "YYYY-MM"
@@ -1592,6 +1856,7 @@ def main() -> None:
     style, export_script = load_export_ui_template(repo_root)
     schedules_by_emp: Dict[str, Any] = {}
     parsed_for_today: Dict[str, Any] | None = None
+    built_days: set[dt.date] = set()
 
     # قائمة الأشهر المتوفرة فعلاً (للـ date picker في JS)
     available_months: List[str] = []
@@ -1600,9 +1865,8 @@ def main() -> None:
     if bytes_next: available_months.append(next_key)
     print(f"📅 Available months: {available_months}")
 
-    tmp_dir = repo_root / ".tmp_import"
-    tmp_dir.mkdir(exist_ok=True)
-
+    # (month_key, xlsx_path, sheet, src_name) لكل شهر صالح — يُحلَّل لاحقاً بالتوازي
+    parse_jobs: List[Tuple[str, str, str, str]] = []
     for month_bytes, month_key, month_start_date in [
         (bytes_prev, prev_key, prev_start),
         (bytes_curr, curr_key, curr_start),
@@ -1616,11 +1880,11 @@ def main() -> None:
         xlsx_path = tmp_dir / f"import_{month_key}.xlsx"
         xlsx_path.write_bytes(month_bytes)
 
-        xls = pd.ExcelFile(str(xlsx_path))
+        sheet_names, sheet_upper, sheet_by_norm = sheet_index(xlsx_path)
 
         # ✅ تحقق أن الكاش يحتوي الشهر الصحيح — إذا ملوث استبدله أو تخطّه
         cache_valid = False
-        for sn in xls.sheet_names:
+        for sn in sheet_names:
             detected = detect_sheet_month(str(xlsx_path), sn)
             if detected == month_key or (month_key_from_filename(sn) == month_key):
                 cache_valid = True
@@ -1631,9 +1895,9 @@ def main() -> None:
 
         if not cache_valid and data and incoming_key == month_key:
             print(f"  ⚠️  الكاش {month_key}.xlsx ملوث — إعادة كاش من الملف الجديد")
-            xlsx_path.write_bytes(data)
-            xls = pd.ExcelFile(str(xlsx_path))
-            (cache_dir / f"{month_key}.xlsx").write_bytes(data)
+            shutil.copyfile(download_path, xlsx_path)
+            sheet_names, sheet_upper, sheet_by_norm = sheet_index(xlsx_path)
+            shutil.copyfile(download_path, cache_dir / f"{month_key}.xlsx")
         elif not cache_valid:
             print(f"  ⚠️  الكاش {month_key}.xlsx ملوث ولا يوجد ملف جديد — تخطي")
             stale_cache = cache_dir / f"{month_key}.xlsx"
@@ -1645,8 +1909,7 @@ def main() -> None:
         # ✅ اختر الشيت الصحيح بناءً على month_key:
         # الأولوية: 1) اسم الشيت المحفوظ في meta.json  2) البحث باسم الشهر  3) الشيت الأول
         target_year, target_month = map(int, month_key.split("-"))
-        target_month_name = ["january","february","march","april","may","june",
-                             "july","august","september","october","november","december"][target_month - 1]
+        target_month_name = _MONTHS[target_month - 1].lower()
 
         # تحقق من meta.json لو فيه sheet_name محدد
         sheet = None
@@ -1654,23 +1917,24 @@ def main() -> None:
         if meta_path.exists():
             try:
                 saved_sheet = json.loads(meta_path.read_text(encoding="utf-8")).get("sheet_name", "")
-                if saved_sheet and saved_sheet in xls.sheet_names:
-                    sheet = saved_sheet
+                if saved_sheet and saved_sheet.strip().upper() in sheet_by_norm:
+                    sheet = sheet_by_norm[saved_sheet.strip().upper()]
                     print(f"  📋 Selected sheet from meta: '{sheet}' for {month_key}")
             except Exception:
                 pass
 
         if not sheet:
             # بحث باسم الشهر في أسماء الشيتات
-            for sn in xls.sheet_names:
-                if target_month_name in sn.lower():
+            target_upper = target_month_name.upper()
+            for sn, su in zip(sheet_names, sheet_upper):
+                if target_upper in su:
                     sheet = sn
                     print(f"  📋 Selected sheet by month name: '{sheet}' for {month_key}")
                     break
 
         if not sheet:
             # الأولوية 3: فحص محتوى كل شيت لاكتشاف الشهر الفعلي
-            for sn in xls.sheet_names:
+            for sn in sheet_names:
                 detected = detect_sheet_month(str(xlsx_path), sn)
                 if detected == month_key:
                     sheet = sn
@@ -1682,7 +1946,7 @@ def main() -> None:
             # ونعطي الشيتات الغامضة شهوراً بالترتيب بدءاً من أقدم شهر مكتشف
             sheet_month_map: dict = {}  # sheet_name -> "YYYY-MM"
             detected_months = []
-            for sn in xls.sheet_names:
+            for sn in sheet_names:
                 k = month_key_from_filename(sn) or detect_sheet_month(str(xlsx_path), sn)
                 if k:
                     sheet_month_map[sn] = k
@@ -1693,7 +1957,7 @@ def main() -> None:
                 anchor_detected = sorted(detected_months)[0]
                 ay, am = map(int, anchor_detected.split("-"))
                 offset = 0
-                for sn in xls.sheet_names:
+                for sn in sheet_names:
                     if sn not in sheet_month_map:
                         # أضف بالترتيب بعد آخر شهر مكتشف
                         last = sorted(sheet_month_map.values())[-1] if sheet_month_map else anchor_detected
@@ -1717,8 +1981,18 @@ def main() -> None:
             if stale_meta.exists():  stale_meta.unlink()
             continue
         src_name = cached_name(month_key) or source_name or sheet
-
-        parsed = parse_month_sheet(str(xlsx_path), sheet, override_month_key=month_key)
+        parse_jobs.append((month_key, str(xlsx_path), sheet, src_name))
+
+    # قراءة الإكسل مقيدة بالمعالج — كل شهر في عملية منفصلة
+    with ProcessPoolExecutor(max_workers=min(3, os.cpu_count() or 1)) as ex:
+        parsed_months = list(ex.map(
+            parse_month_sheet,
+            [job[1] for job in parse_jobs],
+            [job[2] for job in parse_jobs],
+            [job[0] for job in parse_jobs],
+        ))
+
+    for (month_key, _, _, src_name), parsed in zip(parse_jobs, parsed_months):
         parsed["source_filename"] = src_name
 
         # ✅ دائماً نجبر السنة والشهر من month_key (اسم الملف) — لا نثق باسم الشيت
@@ -1726,8 +2000,7 @@ def main() -> None:
             _ky, _km = map(int, month_key.split("-"))
             parsed["year"] = _ky
             parsed["month"] = _km
-            parsed["month_name"] = ["January","February","March","April","May","June",
-                                    "July","August","September","October","November","December"][_km - 1]
+            parsed["month_name"] = _MONTHS[_km - 1]
             print(f"  📌 Forced month from key: {parsed['month_name']} {parsed['year']}")
         except Exception:
             pass
@@ -1740,18 +2013,23 @@ def main() -> None:
         if available_starts:
             nav_min = min(available_starts)
             nav_max_start = max(available_starts)
-            nav_max = dt.date(nav_max_start.year, nav_max_start.month, calendar.monthrange(nav_max_start.year, nav_max_start.month)[1])
+            nav_max = dt.date(nav_max_start.year, nav_max_start.month, _dim(nav_max_start.year, nav_max_start.month))
             parsed["nav_min_date"] = nav_min.strftime("%Y-%m-%d")
             parsed["nav_max_date"] = nav_max.strftime("%Y-%m-%d")
 
-        # بناء صفحات YYYY-MM-DD
-        for d in iter_month_days(parsed["year"], parsed["month"]):
-            day_dir = out_root / d.strftime("%Y-%m-%d")
-            day_dir.mkdir(parents=True, exist_ok=True)
-            html = build_duty_html(style, export_script, parsed, d, repo_base_path="/import", available_months=available_months)
-            # ✅ تنظيف الـ surrogates قبل الكتابة
-            html = html.encode("utf-8", errors="replace").decode("utf-8")
-            (day_dir / "index.html").write_text(html, encoding="utf-8")
+        # بناء صفحات YYYY-MM-DD — الكتابة على خيوط
+        with ThreadPoolExecutor(max_workers=8) as ex:
+            writes = []
+            for d in iter_month_days(parsed["year"], parsed["month"]):
+                day_dir = out_root / d.strftime("%Y-%m-%d")
+                day_dir.mkdir(parents=True, exist_ok=True)
+                html = build_duty_html(style, export_script, parsed, d, repo_base_path="/import", available_months=available_months)
+                # ✅ تنظيف الـ surrogates قبل الكتابة
+                raw = html.encode("utf-8", errors="replace")
+                built_days.add(d)
+                writes.append(ex.submit((day_dir / "index.html").write_bytes, raw))
+            for w in writes:
+                w.result()
 
         # دمج جداول الموظفين
         mk = f"{parsed['year']}-{parsed['month']:02d}"
@@ -1772,39 +2050,15 @@ def main() -> None:
             print(f"  ✅ parsed_for_today set → {parsed['month_name']} {parsed['year']}")
 
     # ── 8. الصفحة الرئيسية ─────────────────────────────────────────
-    landing_html: str | None = None
-
-    # أولاً: نحاول بناء صفحة اليوم مباشرة من البيانات المحملة
-    if parsed_for_today:
-        landing_html = build_duty_html(style, export_script, parsed_for_today, today, repo_base_path="/import", available_months=available_months)
+    # الصفحة الرئيسية نفسها redirect (أدناه) يحسب هدفه من available_dates_list؛
+    # هنا نتأكد فقط من وجود صفحة اليوم — تُبنى فقط إذا لم تولّدها حلقة الأشهر
+    if parsed_for_today and today not in built_days:
         today_dir = out_root / today.strftime("%Y-%m-%d")
+        html = build_duty_html(style, export_script, parsed_for_today, today, repo_base_path="/import", available_months=available_months)
         today_dir.mkdir(parents=True, exist_ok=True)
-        (today_dir / "index.html").write_text(landing_html.encode("utf-8", errors="replace").decode("utf-8"), encoding="utf-8")
+        (today_dir / "index.html").write_bytes(html.encode("utf-8", errors="replace"))
         print(f"✅ Landing page: today {today}")
 
-    # ثانياً: أي يوم من الشهر الحالي (curr_key) من الصفحات المولّدة للتو
-    if landing_html is None:
-        matches = sorted(out_root.glob(f"{curr_key}-*/index.html"), reverse=True)
-        if matches:
-            landing_html = matches[0].read_text(encoding="utf-8")
-            print(f"✅ Landing page: latest {curr_key} day → {matches[0].parent.name}")
-
-    # ثالثاً: أي شهر متوفر — نأخذ الأحدث دائماً
-    if landing_html is None:
-        # نبحث فقط في الأشهر المسموح بها (prev/curr/next) لتجنب أشهر قديمة
-        for mk in [curr_key, next_key, prev_key]:
-            matches = sorted(out_root.glob(f"{mk}-*/index.html"), reverse=True)
-            if matches:
-                landing_html = matches[0].read_text(encoding="utf-8")
-                print(f"⚠️ Landing page fallback: {matches[0].parent.name}")
-                break
-
-    if landing_html is None:
-        landing_html = """<!DOCTYPE html><html><body style="font-family:sans-serif;text-align:center;padding:40px;">
-        <h2>Import Duty Roster</h2><p>No data available yet. Please wait for the next update.</p>
-        </body></html>"""
-        print("⚠️ No pages generated — writing placeholder index")
-
     # ── الصفحة الرئيسية: redirect تلقائي لتاريخ اليوم ──────────
     # إذا لم توجد صفحة اليوم، يذهب لأقرب يوم متوفر من الأشهر المتاحة
     # نبني قائمة بكل التواريخ المتاحة لنضعها في JS
@@ -1906,17 +2160,40 @@ def main() -> None:
     # ── 9. ملفات JSON للموظفين ────────────────────────────────────
     sched_dir = out_root / "schedules"
     sched_dir.mkdir(parents=True, exist_ok=True)
-    for emp_id, payload in schedules_by_emp.items():
-        payload["months"] = sorted(payload.get("schedules", {}).keys())
-        (sched_dir / f"{emp_id}.json").write_text(
-            json.dumps(payload, ensure_ascii=False), encoding="utf-8"
-        )
+
+    def _write_schedule(item: Tuple[str, Dict[str, Any]]) -> bytes:
+        emp_id, payload = item
+        # الأشهر مرتبة مسبقاً حتى لا يعيد المتصفح ترتيبها
+        months = sorted(payload.get("schedules", {}).keys())
+        payload["months"] = months
+        payload["schedules"] = {mk: payload["schedules"][mk] for mk in months}
+        raw = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        (sched_dir / f"{emp_id}.json").write_bytes(raw)
+        return hashlib.blake2b(raw, digest_size=16).digest()
+
+    # الكتابة مقيدة بالـ I/O — نوزعها على خيوط
+    with ThreadPoolExecutor(max_workers=8) as ex:
+        digests = dict(zip(schedules_by_emp, ex.map(_write_schedule, schedules_by_emp.items())))
+
+    # نسخة بيانات الجداول — تتغير مع كل استيراد يغيّر أي جدول، فتُبطل كاش المتصفح والـ SW
+    version_hash = hashlib.blake2b(digest_size=6)
+    for emp_id in sorted(digests):
+        version_hash.update(emp_id.encode("utf-8") + b"\0" + digests[emp_id])
+    schedules_version = version_hash.hexdigest()
 
     # ── 10. صفحة My Schedule ──────────────────────────────────────
     my_dir = out_root / "my-schedules"
     my_dir.mkdir(parents=True, exist_ok=True)
     (my_dir / "index.html").write_text(
-        build_my_schedule_html(style, repo_base_path="/import"), encoding="utf-8"
+        build_my_schedule_html(style, repo_base_path="/import", schedules_version=schedules_version),
+        encoding="utf-8",
+    )
+    (out_root / "roster.css").write_text(build_my_schedule_css(), encoding="utf-8")
+    i18n_dir = out_root / "i18n"
+    i18n_dir.mkdir(parents=True, exist_ok=True)
+    # ar مضمّنة في الصفحة نفسها — لا تُكتب كملف
+    (i18n_dir / "en.json").write_text(
+        json.dumps(MY_SCHEDULE_I18N["en"], ensure_ascii=False, separators=(",", ":")), encoding="utf-8"
     )
 
     # ── 11. ملف meta للتتبع ───────────────────────────────────────
@@ -1931,6 +2208,11 @@ def main() -> None:
     }
     (out_root / "import_meta.json").write_text(json.dumps(meta, indent=2), encoding="utf-8")
 
+    # ── 12. نسخ مضغوطة مسبقاً (اختياري) ──────────────────────────
+    if PRECOMPRESS:
+        n = precompress_tree(out_root)
+        print(f"🗜️  Precompressed {n} files ({'gzip + brotli' if brotli else 'gzip only'})")
+
     print("✅ Generated Import pages in docs/import/")
 
 